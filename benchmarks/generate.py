@@ -0,0 +1,33 @@
+"""
+Benchmark the generation of batches of requests with
+OpenAPIConformance.generate, for each operation in
+tests/data/petstore-expanded.yaml.
+
+Run with ``python -m benchmarks.generate``.
+"""
+
+# std
+import time
+from pathlib import Path
+
+# openapi_conformance
+from openapi_conformance import OpenAPIConformance
+from openapi_conformance.extension import describe_operation
+
+DIR = Path(__file__).parent.parent
+REQUESTS = 1000
+
+
+def main():
+    conformance = OpenAPIConformance(DIR / "tests" / "data" / "petstore-expanded.yaml", None)
+    for operation in conformance.operations:
+        start = time.perf_counter()
+        conformance.generate(operation, REQUESTS, seed=0)
+        elapsed = time.perf_counter() - start
+
+        name = describe_operation(conformance.specification, operation)
+        print(f"{name:<50} {REQUESTS / elapsed:>10.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
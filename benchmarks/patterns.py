@@ -0,0 +1,64 @@
+"""
+Benchmark the generation of strings for pattern constrained schemas,
+using the pattern parameter from tests/data/pattern.yaml.
+
+Run with ``python -m benchmarks.patterns``.
+"""
+
+# std
+import re
+import time
+from pathlib import Path
+
+# 3rd party
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+# openapi_conformance
+from openapi_conformance import OpenAPIConformance
+
+DIR = Path(__file__).parent.parent
+EXAMPLES = 500
+
+
+def benchmark(name, strategy, pattern):
+    """
+    Time the generation of EXAMPLES values from strategy, and count
+    how many of them fully match pattern.
+
+    :param name: Name of the benchmark to report.
+    :param strategy: Strategy generating the values.
+    :param pattern: Compiled pattern the values should match.
+    """
+    values = []
+
+    @given(strategy)
+    @settings(max_examples=EXAMPLES, database=None, deadline=None)
+    def generate(value):
+        values.append(value)
+
+    start = time.perf_counter()
+    generate()
+    elapsed = time.perf_counter() - start
+
+    valid = sum(1 for value in values if pattern.fullmatch(value))
+    print(
+        f"{name:<10} {len(values) / elapsed:>10.0f} values/s "
+        f"{100 * valid / len(values):>6.1f}% fully matching"
+    )
+
+
+def main():
+    conformance = OpenAPIConformance(DIR / "tests" / "data" / "pattern.yaml", None)
+    operation = conformance.specification["/something"].operations["get"]
+    schema = operation.parameters["username"].schema
+
+    # The strategy as it was before pattern strategies were cached and
+    # generated with full match semantics.
+    uncached = st.builds(lambda: st.from_regex(schema.pattern)).flatmap(lambda x: x)
+    benchmark("uncached", uncached, re.compile(schema.pattern.pattern))
+    benchmark("strings", conformance.st.strings(schema), schema.pattern)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark loading a large specification, with OPERATIONS operations
+sharing a component schema, selecting a single operation and then
+creating all the others.
+
+Run with ``python -m benchmarks.spec``.
+"""
+
+# std
+import json
+import tempfile
+import time
+
+# openapi_conformance
+from openapi_conformance import OpenAPIConformance
+
+OPERATIONS = 2000
+
+
+def specification(n):
+    """
+    :param n: The number of operations, half GET and half POST.
+
+    :return: dict containing the specification.
+    """
+    paths = {}
+    for i in range(n // 2):
+        paths[f"/things{i}/{{id}}"] = {
+            method: {
+                "operationId": f"{method}Thing{i}",
+                "tags": [f"tag{i % 10}"],
+                "parameters": [
+                    {"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}}
+                ],
+                "responses": {
+                    "200": {
+                        "description": "success",
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/Thing"}
+                            }
+                        },
+                    }
+                },
+            }
+            for method in ("get", "post")
+        }
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Things", "version": "1.0.0"},
+        "paths": paths,
+        "components": {
+            "schemas": {
+                "Thing": {
+                    "type": "object",
+                    "properties": {"id": {"type": "integer"}, "name": {"type": "string"}},
+                }
+            }
+        },
+    }
+
+
+def main():
+    with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+        json.dump(specification(OPERATIONS), f)
+        f.flush()
+
+        start = time.perf_counter()
+        OpenAPIConformance(f.name, None)
+        validated = time.perf_counter()
+        conformance = OpenAPIConformance(f.name, None, validate_spec=False)
+        loaded = time.perf_counter()
+        conformance.select(operation_id="getThing1")
+        selected = time.perf_counter()
+        list(conformance.operations)
+        everything = time.perf_counter()
+
+    print(f"{'load':<20} {1000 * (validated - start):>10.1f} ms")
+    print(f"{'load unvalidated':<20} {1000 * (loaded - validated):>10.1f} ms")
+    print(f"{'select one':<20} {1000 * (selected - loaded):>10.1f} ms")
+    print(f"{'all operations':<20} {1000 * (everything - selected):>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
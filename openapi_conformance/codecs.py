@@ -0,0 +1,368 @@
+"""
+Codecs for encoding the values generated for request bodies, and for
+decoding request bodies again when validating them.
+"""
+
+# std
+import json
+from urllib.parse import quote_plus, unquote_plus, urlencode
+
+# 3rd party
+from openapi_core.schema.schemas.enums import SchemaType
+from openapi_core.wrappers.mock import MockRequest
+
+CHUNK_SIZE = 64 * 1024
+
+
+class Codec:
+    """
+    Encodes the values generated for a request body of a particular
+    mime type and decodes them again for validation. Subclasses should
+    implement either encode or iter_encode, and decode.
+    """
+
+    def content_type(self, mime_type, value):
+        """
+        :param mime_type: The mime type of the request body.
+        :param value: The value of the request body.
+
+        :return: Value for the Content-Type header of the request.
+        """
+        return mime_type
+
+    def encode(self, value, content_type=None):
+        """
+        :param value: The value to encode.
+        :param content_type: The Content-Type header returned by
+                             content_type for value, if known.
+
+        :return: bytes containing the encoded value.
+        """
+        return b"".join(self.iter_encode(value, content_type=content_type))
+
+    def iter_encode(self, value, chunk_size=CHUNK_SIZE, content_type=None):
+        """
+        Encode a value in chunks, so that large request bodies can be
+        streamed rather than being copied in to one bytes object.
+
+        :param value: The value to encode.
+        :param chunk_size: The maximum size of the chunks.
+        :param content_type: The Content-Type header returned by
+                             content_type for value, if known, so that
+                             e.g. the multipart boundary isn't worked
+                             out again.
+
+        :return: Iterable of bytes like chunks.
+        """
+        yield self.encode(value, content_type)
+
+    def decode(self, body, schema=None):
+        """
+        :param body: The encoded request body.
+        :param schema: openapi_core Schema of the request body, if any.
+
+        :return: The decoded value.
+        """
+        return body
+
+
+class FunctionCodec(Codec):
+    """
+    Codec which encodes using a function, which is how bodies used to be
+    encoded before there were codecs (see mime_type_decoders).
+    """
+
+    def __init__(self, encode, decode=None):
+        """
+        :param encode: Callable taking the value and returning bytes.
+        :param decode: Optional callable taking bytes and returning the
+                       value.
+        """
+        self._encode = encode
+        self._decode = decode
+
+    def encode(self, value, content_type=None):
+        return self._encode(value)
+
+    def decode(self, body, schema=None):
+        return body if self._decode is None else self._decode(body)
+
+
+class JSONCodec(Codec):
+    """
+    Codec for application/json.
+    """
+
+    def encode(self, value, content_type=None):
+        return json.dumps(value).encode()
+
+    def decode(self, body, schema=None):
+        return json.loads(body)
+
+
+def _array_properties(schema):
+    """
+    :param schema: openapi_core Schema of an object, or None.
+
+    :return: set of the names of the properties of schema which are
+             arrays.
+    """
+    if schema is None:
+        return set()
+    return {
+        name
+        for name, property_schema in schema.get_all_properties().items()
+        if property_schema.type == SchemaType.ARRAY
+    }
+
+
+def _collect(fields, schema=None):
+    """
+    Collect the decoded fields of a form into an object. Properties
+    which are arrays in schema are always lists, otherwise properties
+    are lists only when they were repeated, or when they were sent as
+    an empty list.
+
+    :param fields: Iterable of tuples of name and list of values, an
+                   empty list of values for a name sent as an empty
+                   list.
+    :param schema: openapi_core Schema of the form, or None.
+
+    :return: dict of name to value.
+    """
+    arrays = _array_properties(schema)
+    result = {}
+    for name, values in fields:
+        result.setdefault(name, []).extend(values)
+    return {
+        name: values if name in arrays or len(values) != 1 else values[0]
+        for name, values in result.items()
+    }
+
+
+class FormCodec(Codec):
+    """
+    Codec for application/x-www-form-urlencoded. Lists are encoded as
+    repeated keys, and empty lists as a key without a value, there
+    being no standard way to send them. Repeated keys, and the
+    properties which are arrays in the schema, are decoded as lists.
+
+    >>> FormCodec().decode(b"a=1%3D2&b=&a=3&c")
+    {'a': ['1=2', '3'], 'b': '', 'c': []}
+    """
+
+    def encode(self, value, content_type=None):
+        fields = []
+        for name, values in value.items():
+            if values == []:
+                fields.append(quote_plus(str(name)))
+            else:
+                fields.append(urlencode({name: values}, doseq=True))
+        return "&".join(fields).encode()
+
+    def decode(self, body, schema=None):
+        if isinstance(body, bytes):
+            body = body.decode()
+        fields = []
+        for field in body.split("&"):
+            if field:
+                name, equals, value = field.partition("=")
+                fields.append((unquote_plus(name), [unquote_plus(value)] if equals else []))
+        return _collect(fields, schema)
+
+
+class BinaryCodec(Codec):
+    """
+    Codec for binary request bodies, e.g. application/octet-stream. The
+    value is used as the body as is, and chunks are views on to it, so
+    that large bodies are never copied. Strings, for schemas which
+    aren't of the binary format, are encoded as UTF-8.
+    """
+
+    def encode(self, value, content_type=None):
+        if isinstance(value, str):
+            return value.encode()
+        return value if isinstance(value, bytes) else bytes(value)
+
+    def iter_encode(self, value, chunk_size=CHUNK_SIZE, content_type=None):
+        view = memoryview(value.encode() if isinstance(value, str) else value)
+        for start in range(0, len(view), chunk_size):
+            end = start + chunk_size
+            yield view[start:end]
+
+    def decode(self, body, schema=None):
+        is_text = schema is not None and schema.type == SchemaType.STRING
+        if is_text and schema.format != "binary" and isinstance(body, bytes):
+            return body.decode()
+        return body
+
+
+class MultipartCodec(Codec):
+    """
+    Codec for multipart/form-data. Each property of the value becomes a
+    part, bytes are sent as application/octet-stream, str as text/plain
+    and everything else as application/json. Lists are sent as repeated
+    parts, and empty lists as a part without a Content-Type. Repeated
+    parts, and the properties which are arrays in the schema, are
+    decoded as lists.
+    """
+
+    def boundary(self, value):
+        """
+        Get a boundary which doesn't occur in any of the parts, the
+        boundary only depends on the value so that encoding the same
+        value always gives the same body.
+
+        :param value: The value to encode.
+
+        :return: bytes containing the boundary.
+        """
+        # Views have to be searched as bytes, only bytearray and views
+        # are copied, bytes(bytes) is the same object.
+        parts = [bytes(content) for _, _, content in self._parts(value)]
+        boundary, i = b"openapi-conformance-boundary", 0
+        while any(boundary in part for part in parts):
+            i += 1
+            boundary = b"openapi-conformance-boundary-%d" % i
+        return boundary
+
+    def content_type(self, mime_type, value):
+        return f"{mime_type}; boundary={self.boundary(value).decode()}"
+
+    def iter_encode(self, value, chunk_size=CHUNK_SIZE, content_type=None):
+        if content_type is None:
+            boundary = self.boundary(value)
+        else:
+            boundary = content_type.rpartition("boundary=")[2].encode()
+        for name, content_type, content in self._parts(value):
+            yield b"--%s\r\nContent-Disposition: form-data; name=%s\r\n" % (
+                boundary,
+                json.dumps(name).encode(),
+            )
+            if content_type is not None:
+                yield b"Content-Type: %s\r\n" % content_type.encode()
+            yield b"\r\n"
+            yield from BinaryCodec().iter_encode(content, chunk_size)
+            yield b"\r\n"
+        yield b"--%s--\r\n" % boundary
+
+    def decode(self, body, schema=None):
+        boundary, _, body = body.partition(b"\r\n")
+        fields = []
+        for part in body.split(b"\r\n" + boundary)[:-1]:
+            head, _, content = part.partition(b"\r\n\r\n")
+            headers = dict(line.split(b": ", 1) for line in head.split(b"\r\n") if b": " in line)
+            name = json.loads(headers[b"Content-Disposition"].split(b"name=", 1)[1])
+            fields.append((name, self._decode_part(headers.get(b"Content-Type"), content)))
+        return _collect(fields, schema)
+
+    @staticmethod
+    def _decode_part(content_type, content):
+        """
+        :param content_type: The Content-Type of the part, or None.
+        :param content: The content of the part.
+
+        :return: list containing the value of the part, or an empty
+                 list for a part without a Content-Type.
+        """
+        if content_type is None:
+            return []
+        if content_type == b"application/octet-stream":
+            return [bytes(content)]
+        if content_type == b"application/json":
+            return [json.loads(content)]
+        return [content.decode()]
+
+    @staticmethod
+    def _parts(value):
+        """
+        :param value: The value to encode.
+
+        :return: Generator of tuples of name, content type and content,
+                 the content type is None for empty lists.
+        """
+        for name, values in value.items():
+            if values == []:
+                yield name, None, b""
+            for item in values if isinstance(values, list) else [values]:
+                if isinstance(item, (bytes, bytearray, memoryview)):
+                    yield name, "application/octet-stream", item
+                elif isinstance(item, str):
+                    yield name, "text/plain", item.encode()
+                else:
+                    yield name, "application/json", json.dumps(item).encode()
+
+
+CODECS = {
+    "application/json": JSONCodec(),
+    "application/x-www-form-urlencoded": FormCodec(),
+    "application/octet-stream": BinaryCodec(),
+    "multipart/form-data": MultipartCodec(),
+}
+
+
+class EncodedRequest(MockRequest):
+    """
+    MockRequest with a body encoded by a Codec. The body is only encoded
+    once it is first used, and can also be streamed in chunks using
+    iter_body without ever being joined in to one bytes object.
+    """
+
+    def __init__(self, host_url, method, path, codec, value, mimetype, **kwargs):
+        """
+        :param host_url: See MockRequest.
+        :param method: See MockRequest.
+        :param path: See MockRequest.
+        :param codec: Codec to encode the body with.
+        :param value: The value of the body, or None for no body.
+        :param mimetype: The mime type of the body.
+        :param kwargs: Passed on to MockRequest.
+        """
+        super().__init__(host_url, method, path, mimetype=mimetype, **kwargs)
+        self.codec = codec
+        self.value = value
+        self._body = None
+        self._content_type = None
+
+    @property
+    def body(self):
+        """
+        :return: The encoded body as bytes, or an empty str when there
+                 is no body.
+        """
+        if self._body is None:
+            self._body = (
+                "" if self.value is None else self.codec.encode(self.value, self.content_type)
+            )
+        return self._body
+
+    @body.setter
+    def body(self, body):
+        self._body = body
+
+    @property
+    def content_type(self):
+        """
+        :return: Value for the Content-Type header of the request, e.g.
+                 including the multipart boundary.
+        """
+        if self._content_type is None:
+            self._content_type = (
+                self.mimetype
+                if self.value is None
+                else self.codec.content_type(self.mimetype, self.value)
+            )
+        return self._content_type
+
+    def iter_body(self, chunk_size=CHUNK_SIZE):
+        """
+        :param chunk_size: The maximum size of the chunks.
+
+        :return: Iterable of bytes like chunks of the body.
+        """
+        if self.value is None:
+            return ()
+        if self._body is not None:
+            # The body has already been encoded, e.g. for its fingerprint.
+            return BinaryCodec().iter_encode(self._body, chunk_size)
+        return self.codec.iter_encode(self.value, chunk_size, self.content_type)
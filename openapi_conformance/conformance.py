@@ -1,18 +1,88 @@
 # std
-import json
-from urllib.parse import urlencode
+import threading
+import traceback
+from collections import OrderedDict, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 
 # 3rd party
-from hypothesis import given
-from hypothesis import strategies as st
+from hypothesis import example, given, settings
+from hypothesis.database import DirectoryBasedExampleDatabase, ExampleDatabase
 from openapi_core.schema.parameters.enums import ParameterLocation
 from openapi_core.validation.request.validators import RequestValidator
 from openapi_core.validation.response.validators import ResponseValidator
-from openapi_core.wrappers.mock import MockRequest
+from toolz import concat
 
 # openapi_conformance
-from openapi_conformance.extension import create_spec, operations, validate
-from openapi_conformance.strategies import Strategies
+from openapi_conformance.codecs import CODECS, EncodedRequest, FunctionCodec
+from openapi_conformance.extension import (
+    create_spec,
+    operation_fingerprint,
+    operations,
+    request_fingerprint,
+    select_operations,
+    validate,
+)
+from openapi_conformance.latency import seek_latency
+from openapi_conformance.load import generate_load
+from openapi_conformance.strategies import Strategies, draw_examples
+
+SAFE_METHODS = {"get", "head"}
+
+Failure = namedtuple("Failure", "operation request response error unmarshal_log")
+
+RequestRecord = namedtuple(
+    "RequestRecord", "method path path_parameters query headers cookies body content_type"
+)
+
+
+def failure_origin(error):
+    """
+    Get where an error originated, errors with the same origin are
+    considered to be the same failure.
+
+    :param error: The exception.
+
+    :return: Tuple of exception type, filename and line number.
+    """
+    frame = traceback.extract_tb(error.__traceback__)[-1]
+    return type(error), frame.filename, frame.lineno
+
+
+class ResponseCache:
+    """
+    Least recently used cache of responses keyed by request fingerprint.
+    """
+
+    def __init__(self, maxsize):
+        """
+        :param maxsize: The maximum number of responses to hold on to.
+        """
+        self.maxsize = maxsize
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint):
+        """
+        :param fingerprint: Fingerprint of the request.
+
+        :return: The cached response or None if there is none.
+        """
+        with self._lock:
+            if fingerprint in self._responses:
+                self._responses.move_to_end(fingerprint)
+            return self._responses.get(fingerprint)
+
+    def put(self, fingerprint, response):
+        """
+        :param fingerprint: Fingerprint of the request.
+        :param response: The response to cache.
+        """
+        with self._lock:
+            self._responses[fingerprint] = response
+            self._responses.move_to_end(fingerprint)
+            while len(self._responses) > self.maxsize:
+                self._responses.popitem(last=False)
 
 
 class OpenAPIConformance:
@@ -27,6 +97,12 @@ class OpenAPIConformance:
         format_strategies=None,
         format_unmarshallers=None,
         mime_type_decoders=None,
+        codecs=None,
+        deduplicate_requests=True,
+        response_cache_size=0,
+        max_body_size=None,
+        example_database=None,
+        validate_spec=True,
     ):
         """
         The actual request is made by the send_request callable,
@@ -50,6 +126,11 @@ class OpenAPIConformance:
                             this data for the particular mime type
                             associated with the body.
 
+            Requests with a body are EncodedRequest objects, whose
+            body can also be streamed in chunks using iter_body and
+            whose content_type is the value of the Content-Type header
+            to send, e.g. including the multipart boundary.
+
             send_request should return an instance of a type which
             implements ``BaseOpenAPIResponse`` containing the response
             from the implementation.
@@ -63,16 +144,61 @@ class OpenAPIConformance:
                                      should be the format name, with the
                                      value being an openapi_core.schema.schemas.models.Format
                                      object.
+        :param mime_type_decoders: dictionary of mime type to callable
+                                   taking the request body and returning
+                                   it encoded as bytes. Prefer codecs.
+        :param codecs: dictionary of mime type to
+                       openapi_conformance.codecs.Codec used to encode
+                       request bodies and decode them for validation,
+                       in addition to the default CODECS.
+        :param deduplicate_requests: When True requests which are
+                                     identical to a request which has
+                                     already been checked for the same
+                                     operation are not sent again,
+                                     this assumes the implementation
+                                     always responds to the same request
+                                     in the same way.
+        :param response_cache_size: The number of responses to GET and
+                                    HEAD requests to remember, identical
+                                    requests are checked against the
+                                    remembered response rather than
+                                    being sent again. Defaults to 0,
+                                    which disables the cache.
+        :param max_body_size: Budget in bytes for generating request
+                              bodies, see Strategies.
+        :param example_database: Directory, or hypothesis ExampleDatabase,
+                                 in which the failing examples of each
+                                 operation are stored, keyed by
+                                 operation_fingerprint, these are
+                                 replayed before generating new
+                                 examples. Share the directory between
+                                 CI jobs to catch regressions quickly.
+                                 Defaults to the database of the
+                                 current hypothesis settings.
+        :param validate_spec: When False the specification isn't
+                              validated when it's loaded, which saves
+                              time for large specifications which are
+                              known to be valid.
         """
-        self.specification = create_spec(specification)
+        self.specification = create_spec(specification, validate_spec)
         self.send_request = send_request
-        self.st = Strategies(format_strategies)
+        self.st = Strategies(format_strategies, max_body_size)
         self.format_unmarshallers = format_unmarshallers
-        self.mime_type_decoders = {
-            "application/json": lambda data: json.dumps(data).encode(),
-            "application/x-www-form-urlencoded": lambda data: urlencode(data).encode(),
-            **(mime_type_decoders or {}),
+        self.codecs = {
+            **CODECS,
+            **{
+                mime_type: FunctionCodec(encode, getattr(CODECS.get(mime_type), "decode", None))
+                for mime_type, encode in (mime_type_decoders or {}).items()
+            },
+            **(codecs or {}),
         }
+        self.deduplicate_requests = deduplicate_requests
+        self.response_cache = ResponseCache(response_cache_size)
+        self._conforming_requests = defaultdict(set)
+        if example_database is None or isinstance(example_database, ExampleDatabase):
+            self.example_database = example_database
+        else:
+            self.example_database = DirectoryBasedExampleDatabase(str(example_database))
 
     @property
     def operations(self):
@@ -93,53 +219,248 @@ class OpenAPIConformance:
             validator_type(self.specification, self.format_unmarshallers)
             for validator_type in (RequestValidator, ResponseValidator)
         )
-        validate(request_validator, request)
-        validate(response_validator, request, response)
+        validate(request_validator, request, codecs=self.codecs)
+        validate(response_validator, request, response, codecs=self.codecs)
 
-    def check_operation(self, operation):
+    def check_operation(self, operation, failures=None):
         """
         Check that the implementation of a given operation conforms to
         the specification. If the implementation doesn't conform to the
         specification then an Exception is raised.
 
         :param operation: openapi_core Operation object
+        :param failures: Optional dict in which a Failure is recorded
+                         for each distinct failure, keyed by
+                         failure_origin. Since hypothesis replays the
+                         minimal example of each failure last, these
+                         are the minimal failures once this returns.
         """
 
-        @given(st.data())
-        def do_test(data):
+        @given(self.st.requests(operation))
+        def do_test(request_values):
+            self._check_request(operation, request_values, failures)
 
-            if operation.parameters:
-                parameters = data.draw(self.st.parameter_lists(operation.parameters))
-            else:
-                parameters = None
+        # Requests made up of the examples in the specification are
+        # explicit examples, so hypothesis tries them before generating
+        # anything, they come out of the budget for random generation.
+        example_requests = self.st.example_requests(operation)
+        for request_values in example_requests:
+            do_test = example(request_values)(do_test)
+        test_settings = {}
+        if example_requests:
+            test_settings["max_examples"] = max(1, settings().max_examples - len(example_requests))
+        if self.example_database is not None:
+            test_settings["database"] = self.example_database
+        if test_settings:
+            do_test = settings(**test_settings)(do_test)
 
-            if operation.request_body:
-                mime_type, content = data.draw(
-                    st.sampled_from(list(operation.request_body.content.items()))
-                )
-                request_body = data.draw(self.st.schema_values(content.schema))
-            else:
-                mime_type = "application/json"
-                request_body = None
+        # Hypothesis keys the examples it stores by the test function,
+        # which is the same do_test for every operation, so key them by
+        # operation too. Stored examples are replayed before generation.
+        do_test.hypothesis.inner_test._hypothesis_internal_add_digest = operation_fingerprint(
+            self.specification, operation
+        )
+        do_test()
 
-            request, response = self._make_request(operation, parameters, request_body, mime_type)
+    def _check_request(self, operation, request_values, failures=None):
+        """
+        Send a request to the implementation of operation and check that
+        the response conforms, see check_operation.
+
+        :param operation: openapi_core Operation object
+        :param request_values: RequestValues to create the request from.
+        :param failures: Optional dict in which a Failure is recorded,
+                         see check_operation.
+        """
+        request = self._create_request(operation, *request_values)
+        fingerprint = None
+        if self.deduplicate_requests:
+            fingerprint = request_fingerprint(request)
+            if fingerprint in self._conforming_requests[operation]:
+                return
+
+        response = None
+        try:
+            response = self._send_request(operation, request, fingerprint)
             self.check_response(request, response)
+        except Exception as e:
+            if failures is not None:
+                unmarshal_log = getattr(e, "unmarshal_log", None)
+                failures[failure_origin(e)] = Failure(
+                    operation, request, response, e, unmarshal_log
+                )
+            raise
+        if self.deduplicate_requests:
+            self._conforming_requests[operation].add(fingerprint)
 
-        do_test()
+    def select(self, **criteria):
+        """
+        Get the operations matching some criteria, without creating any
+        of the other operations in the specification.
+
+        :param criteria: operation_id, tag, method and/or path_prefix,
+                         see ``openapi_conformance.extension.OperationIndex.select``.
 
-    def check(self):
+        :return: list of openapi_core Operation objects.
+        """
+        return list(select_operations(self.specification, **criteria))
+
+    def check(self, collect_failures=False, threads=1, select=None):
         """
         Check that an implementation conforms to the given
         specification.
 
         If the implementation doesn't conform to the specification then
-        an Exception is raised.
+        an Exception is raised, unless collect_failures is True.
+
+        :param collect_failures: When True all operations are checked,
+                                 rather than stopping at the first
+                                 operation which fails, and the minimal
+                                 failures are returned.
+        :param threads: The number of operations to check concurrently,
+                        each on its own thread. This is useful when
+                        send_request spends most of its time waiting on
+                        I/O, send_request must then be thread safe.
+        :param select: dict of criteria selecting the operations to
+                       check (see select), by default all operations
+                       are checked.
+
+        :return: When collecting failures a list of Failure, with the
+                 operation, minimal request, its response, the error
+                 and the unmarshal log of each failure.
+        """
+        check_operation = self._collect_failures if collect_failures else self.check_operation
+        operations = self.operations if select is None else self.select(**select)
+
+        if threads > 1:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                futures = [executor.submit(check_operation, operation) for operation in operations]
+                try:
+                    results = [future.result() for future in futures]
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        else:
+            results = [check_operation(operation) for operation in operations]
+
+        if collect_failures:
+            return list(concat(results))
+
+    def _collect_failures(self, operation):
+        """
+        Check an operation, collecting the minimal failures rather than
+        raising an Exception.
+
+        :param operation: openapi_core Operation object
 
-        :param specification: openapi_core` Spec object
-        :param send_request: Callable to invoke the implementation.
+        :return: list of Failure.
         """
+        failures = {}
+        try:
+            self.check_operation(operation, failures)
+        except Exception as e:
+            # e.g. hypothesis failed to generate a request.
+            if not failures:
+                failures[failure_origin(e)] = Failure(operation, None, None, e, None)
+        return list(failures.values())
+
+    def load(self, duration, rate=None, concurrency=1, weights=None, validate=0.1, seed=None):
+        """
+        Generate load on an implementation by sending it generated
+        requests for a given duration, reporting latency percentiles,
+        throughput and conformance failure rates per operation.
+
+        See ``openapi_conformance.load.generate_load`` for a description
+        of the parameters.
+
+        :return: openapi_conformance.load.LoadReport
+        """
+        return generate_load(self, duration, rate, concurrency, weights, validate, seed)
+
+    def seek_latency(self, thresholds=None, slowest=5, response_size=False):
+        """
+        Search for the requests to which the implementation of each
+        operation is slowest to respond, using hypothesis' targeted
+        search, see ``openapi_conformance.latency.seek_latency``.
+
+        :param thresholds: Latency threshold in seconds for every
+                           operation, or dict of openapi_core Operation
+                           or operationId to threshold. Operations
+                           without a threshold use the
+                           x-latency-threshold extension of the
+                           operation in the specification, if any.
+        :param slowest: The number of slowest requests to report for
+                        each operation.
+        :param response_size: When True the size of the response is also
+                              maximised.
+
+        :return: list of openapi_conformance.latency.LatencyReport, the
+                 reports of operations which exceeded their threshold
+                 have the minimal request which did so in exceeded.
+        """
+        if not isinstance(thresholds, dict):
+            thresholds = {operation: thresholds for operation in self.operations}
+        reports = []
         for operation in self.operations:
-            self.check_operation(operation)
+            threshold = thresholds.get(operation, thresholds.get(operation.operation_id))
+            if threshold is None:
+                threshold = getattr(operation, "latency_threshold", None)
+            reports.append(seek_latency(self, operation, threshold, slowest, response_size))
+        return reports
+
+    def generate(self, operation, n, seed=None):
+        """
+        Generate a batch of requests for an operation, without the
+        overhead of running hypothesis tests or creating openapi_core
+        requests, so that other tools such as load generators and
+        fuzzers can make use of the generated requests.
+
+        :param operation: openapi_core Operation object.
+        :param n: The number of requests to generate.
+        :param seed: Seed for generating the requests, the same seed
+                     generates the same requests.
+
+        :return: list of RequestRecord, with the path parameters
+                 substituted in the path, the parameters split by
+                 location in dicts of name to value and the body
+                 encoded as bytes, or None when there is no body.
+        """
+        method = operation.http_method.upper()
+        path_pattern = self._path(operation)
+        records = []
+
+        for parameters, request_body, mime_type in draw_examples(
+            self.st.requests(operation), n, seed
+        ):
+            values = {location: {} for location in ParameterLocation}
+            for parameter, value in parameters or ():
+                values[parameter.location][parameter.name] = value
+            path_parameters = values[ParameterLocation.PATH]
+            path = path_pattern.format(
+                **{name: quote(str(value), safe="") for name, value in path_parameters.items()}
+            )
+
+            if request_body is None:
+                body, content_type = None, None
+            else:
+                codec = self.codecs[mime_type]
+                content_type = codec.content_type(mime_type, request_body)
+                body = codec.encode(request_body, content_type)
+
+            records.append(
+                RequestRecord(
+                    method,
+                    path,
+                    path_parameters,
+                    values[ParameterLocation.QUERY],
+                    values[ParameterLocation.HEADER],
+                    values[ParameterLocation.COOKIE],
+                    body,
+                    content_type,
+                )
+            )
+        return records
 
     def _make_request(
         self, operation, parameters=None, request_body=None, mime_type="application/json"
@@ -158,9 +479,24 @@ class OpenAPIConformance:
 
         :return: tuple of (BaseOpenAPIRequest, BaseOpenAPIResponse)
         """
-        path = self.specification.default_url + operation.path_name
-        slashes = ("/" if x("/") else "" for x in (path.startswith, path.endswith))
-        path = path.strip("/").join(slashes)
+        request = self._create_request(operation, parameters, request_body, mime_type)
+        return request, self._send_request(operation, request)
+
+    def _create_request(
+        self, operation, parameters=None, request_body=None, mime_type="application/json"
+    ):
+        """
+        Create a request to an implementation of operation in the given
+        OpenAPI specification.
+
+        :param operation: openapi_core Operation object.
+        :param parameters: openapi_core Parameters object.
+        :param request_body: data to send in the request body.
+        :param mime_type: the mime type of the request body.
+
+        :return: EncodedRequest object.
+        """
+        path = self._path(operation)
 
         if parameters:
             view_args = {}
@@ -174,18 +510,45 @@ class OpenAPIConformance:
             args = {}
             view_args = {}
 
-        if request_body is not None:
-            data = self.mime_type_decoders[mime_type](request_body)
-        else:
-            data = b""
-
-        request = MockRequest(
+        return EncodedRequest(
             f"http://host.com/",
             operation.http_method,
-            path=path,
+            path,
+            self.codecs[mime_type] if request_body is not None else None,
+            request_body,
+            mime_type,
             args=args,
             view_args=view_args,
-            data=data,
-            mimetype=mime_type,
         )
-        return request, self.send_request(operation, request)
+
+    def _path(self, operation):
+        """
+        :param operation: openapi_core Operation object.
+
+        :return: The path pattern of operation, including the path of
+                 the default server url.
+        """
+        path = self.specification.default_url + operation.path_name
+        slashes = ("/" if x("/") else "" for x in (path.startswith, path.endswith))
+        return path.strip("/").join(slashes)
+
+    def _send_request(self, operation, request, fingerprint=None):
+        """
+        Send a request using send_request, responses to GET and HEAD
+        requests are taken from and stored in the response cache.
+
+        :param operation: openapi_core Operation object.
+        :param request: openapi_core BaseOpenAPIRequest object.
+        :param fingerprint: Fingerprint of request, if already known.
+
+        :return: BaseOpenAPIResponse object.
+        """
+        if not self.response_cache.maxsize or operation.http_method not in SAFE_METHODS:
+            return self.send_request(operation, request)
+
+        fingerprint = fingerprint or request_fingerprint(request)
+        response = self.response_cache.get(fingerprint)
+        if response is None:
+            response = self.send_request(operation, request)
+            self.response_cache.put(fingerprint, response)
+        return response
@@ -6,19 +6,33 @@ itself.
 
 # std
 import contextlib
-import copy
-from collections import namedtuple
-from unittest.mock import patch
-from urllib.parse import unquote_plus
+import hashlib
+import json
+import threading
+from collections import defaultdict, namedtuple
+from collections.abc import Mapping
+from functools import lru_cache, partial
+from typing import Dict, Hashable
 
 # 3rd party
-from openapi_core import create_spec as _create_spec
-from openapi_core.schema.media_types.models import MEDIA_TYPE_DESERIALIZERS
+from jsonschema.validators import RefResolver
+from openapi_core.schema.media_types.models import MediaType
+from openapi_core.schema.paths.models import Path
+from openapi_core.schema.request_bodies.models import RequestBody
 from openapi_core.schema.schemas.enums import SchemaFormat, SchemaType
 from openapi_core.schema.schemas.exceptions import OpenAPISchemaError
 from openapi_core.schema.schemas.models import Format, Schema
+from openapi_core.schema.schemas.registries import SchemaRegistry
+from openapi_core.schema.specs.factories import SpecFactory
+from openapi_core.schema.specs.models import Spec
 from openapi_core.validation.response.validators import ResponseValidator  # noqa
+from openapi_spec_validator import default_handlers, openapi_v3_spec_validator
+from openapi_spec_validator.validators import Dereferencer, PathItemValidator
 from ruamel.yaml import round_trip_load
+from toolz import concat, valmap
+
+# openapi_conformance
+from openapi_conformance.codecs import CODECS, EncodedRequest
 
 
 def _schema_dict(schema):  # noqa
@@ -67,6 +81,60 @@ def _schema_dict(schema):  # noqa
     }
 
 
+class _ThreadLocalAttribute:
+    """
+    Descriptor which replaces a class attribute so that it can be
+    patched for the current thread only, see patch_attribute.
+    """
+
+    def __init__(self, original):
+        """
+        :param original: The original value of the attribute.
+        """
+        self.original = original
+        self.local = threading.local()
+
+    @property
+    def value(self):
+        """
+        :return: The value of the attribute in the current thread.
+        """
+        return getattr(self.local, "value", self.original)
+
+    def __get__(self, instance, owner):
+        value = self.value
+        return value.__get__(instance, owner) if hasattr(value, "__get__") else value
+
+
+_patch_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def patch_attribute(cls, name, value):
+    """
+    Patch an attribute of a class for the current thread only, unlike
+    unittest.mock.patch which patches it for every thread. This allows
+    the patches made while validating to be made concurrently from
+    multiple threads without them leaking into each other.
+
+    :param cls: The class to patch.
+    :param name: The name of the attribute to patch.
+    :param value: The value to patch the attribute with.
+    """
+    with _patch_lock:
+        attribute = cls.__dict__[name]
+        if not isinstance(attribute, _ThreadLocalAttribute):
+            attribute = _ThreadLocalAttribute(attribute)
+            setattr(cls, name, attribute)
+
+    previous = attribute.value
+    attribute.local.value = value
+    try:
+        yield
+    finally:
+        attribute.local.value = previous
+
+
 @contextlib.contextmanager
 def strict_bool():
     """
@@ -81,8 +149,7 @@ def strict_bool():
     patched = dict(original)
     patched[SchemaType.BOOLEAN] = strict_to_bool
 
-    target = "openapi_core.schema.schemas.models.Schema.DEFAULT_CAST_CALLABLE_GETTER"
-    with patch(target, patched):
+    with patch_attribute(Schema, "DEFAULT_CAST_CALLABLE_GETTER", patched):
         yield
 
 
@@ -114,8 +181,7 @@ def strict_str():
     patched = dict(original)
     patched[SchemaFormat.NONE] = Format(strict_to_str, lambda x: isinstance(x, str))
 
-    target = "openapi_core.schema.schemas.models.Schema.STRING_FORMAT_CALLABLE_GETTER"
-    with patch(target, patched):
+    with patch_attribute(Schema, "STRING_FORMAT_CALLABLE_GETTER", patched):
         yield
 
 
@@ -128,7 +194,7 @@ def record_unmarshal():
     Record calls to Shema.unmarshal so that when something fails we can
     actually show a nice error message to the user.
     """
-    original = copy.deepcopy(Schema.unmarshal)
+    original = Schema.unmarshal
     log = []
 
     def unmarshal(self, value, custom_formatters=None):
@@ -137,23 +203,415 @@ def record_unmarshal():
         log[-1] = _Value(log[-1].schema, log[-1].value, True)
         return result
 
-    target = "openapi_core.schema.schemas.models.Schema.unmarshal"
-    with patch(target, unmarshal):
+    with patch_attribute(Schema, "unmarshal", unmarshal):
         yield log
 
 
-def create_spec(specification_path):
+def _examples(spec, dereferencer):
+    """
+    Get the example values given in the example and examples fields of
+    a schema, parameter or media type definition.
+
+    :param spec: The dereferenced definition to get the examples of.
+    :param dereferencer: openapi_spec_validator Dereferencer used to
+                         resolve references to example objects.
+
+    :return: list of example values.
+    """
+    result = [spec["example"]] if "example" in spec else []
+    examples = spec.get("examples")
+    if isinstance(examples, dict):
+        examples = map(dereferencer.dereference, examples.values())
+        result.extend(example["value"] for example in examples if "value" in example)
+    return result
+
+
+def structural_key(spec, dereferencer, refs=()):
+    """
+    Get a key identifying the structure of a part of the specification,
+    with all references resolved. Parts of specifications which are
+    structurally the same have the same key, also when they come from
+    different specifications. References back to a schema which is
+    already being resolved are replaced by how many references back
+    that schema is, so that recursive schemas have a key too.
+
+    >>> structural_key({"type": "integer", "minimum": 1}, None)
+    ('dict', (('minimum', ('int', 1)), ('type', ('str', 'integer'))))
+
+    :param spec: The part of the specification to get the key of.
+    :param dereferencer: openapi_spec_validator Dereferencer.
+    :param refs: The references resolved to get to spec.
+
+    :return: Hashable key.
+    """
+    if isinstance(spec, dict):
+        ref = spec.get("$ref")
+        if ref is not None:
+            if ref in refs:
+                return "$recursive", len(refs) - refs.index(ref)
+            return structural_key(dereferencer.dereference(spec), dereferencer, refs + (ref,))
+        items = ((key, structural_key(value, dereferencer, refs)) for key, value in spec.items())
+        return "dict", tuple(sorted(items))
+    if isinstance(spec, list):
+        return "list", tuple(structural_key(value, dereferencer, refs) for value in spec)
+    return type(spec).__name__, spec
+
+
+# structural_key -> Schema, see InterningSchemaRegistry
+_interned_schemas: Dict[Hashable, Schema] = {}
+_interned_schemas_lock = threading.Lock()
+
+
+class InterningSchemaRegistry(SchemaRegistry):
+    """
+    SchemaRegistry which interns the schemas it creates in a process
+    wide table keyed by their structural_key, so that schemas which are
+    the same share one Schema object across operations and across
+    specifications. This means they also share everything which is
+    cached for them, like openapi_core's required properties and the
+    strategies used to generate values for them.
+
+    Validators are out of scope: openapi_core validates values with the
+    methods of the Schema itself rather than with validator objects
+    compiled from it, so there is nothing more to share, and its
+    request and response validators only hold on to a specification.
+
+    openapi_core discards the examples given in schemas, this registry
+    keeps hold of them as a list in Schema.examples. Since schemas
+    which are references are created lazily by openapi_core we have to
+    do this in the registry rather than patching things up afterwards.
+
+    Schemas which are references are created when they are first used,
+    which may be on any thread, so schemas are created holding lock,
+    which InterningSpecFactory also holds while creating the other
+    parts of the specification which are created lazily.
+    """
+
+    def __init__(self, dereferencer):
+        """
+        :param dereferencer: openapi_spec_validator Dereferencer.
+        """
+        super().__init__(dereferencer)
+        self.lock = threading.RLock()
+
+    def create(self, schema_spec):
+        with self.lock:
+            key = structural_key(schema_spec, self.dereferencer)
+            with _interned_schemas_lock:
+                schema = _interned_schemas.get(key)
+            if schema is None:
+                schema = super().create(schema_spec)
+                schema_deref = self.dereferencer.dereference(schema_spec)
+                schema.examples = _examples(schema_deref, self.dereferencer)
+                with _interned_schemas_lock:
+                    schema = _interned_schemas.setdefault(key, schema)
+            return schema
+
+
+def record_latency_threshold(operation, operation_spec):
+    """
+    Store the x-latency-threshold extension of an operation, in seconds,
+    in the latency_threshold attribute of the Operation object, or None
+    when the operation has no threshold.
+
+    :param operation: openapi_core Operation object.
+    :param operation_spec: The dereferenced specification the Operation
+                           object was created from.
+    """
+    operation.latency_threshold = operation_spec.get("x-latency-threshold")
+
+
+def record_operation_examples(operation, operation_spec, dereferencer):
+    """
+    Store the examples given for the parameters and request body media
+    types of an operation as a list in the examples attribute of the
+    Parameter and MediaType objects.
+
+    :param operation: openapi_core Operation object.
+    :param operation_spec: The dereferenced specification the Operation
+                           object was created from.
+    :param dereferencer: openapi_spec_validator Dereferencer.
+    """
+    for parameter_spec in operation_spec.get("parameters", []):
+        parameter_spec = dereferencer.dereference(parameter_spec)
+        parameter = operation.parameters[parameter_spec["name"]]
+        parameter.examples = _examples(parameter_spec, dereferencer)
+
+    if operation.request_body:
+        request_body_spec = dereferencer.dereference(operation_spec["requestBody"])
+        for mime_type, media_type_spec in request_body_spec["content"].items():
+            media_type = operation.request_body.content[mime_type]
+            media_type.examples = _examples(dereferencer.dereference(media_type_spec), dereferencer)
+
+
+class LazyOperations(Mapping):
+    """
+    Mapping of http method to the openapi_core Operation objects of a
+    path, which only creates an Operation, with its parameters, request
+    body and responses, when it is first looked up.
+    """
+
+    def __init__(self, path_name, path_spec, operations_generator, dereferencer, lock):
+        """
+        :param path_name: The name of the path, e.g. /pets/{id}.
+        :param path_spec: The dereferenced specification of the path.
+        :param operations_generator: openapi_core OperationsGenerator.
+        :param dereferencer: openapi_spec_validator Dereferencer.
+        :param lock: Lock held while creating operations, the
+                     dereferencer isn't thread safe so this is shared
+                     by all the paths of a specification.
+        """
+        self.path_name = path_name
+        self._path_spec = path_spec
+        self._operations_generator = operations_generator
+        self._dereferencer = dereferencer
+        self._lock = lock
+        self._operations = {}
+        self._http_methods = [
+            http_method for http_method in path_spec if http_method in PathItemValidator.OPERATIONS
+        ]
+
+    def __getitem__(self, http_method):
+        operation = self._operations.get(http_method)
+        if operation is not None:
+            return operation
+        if http_method not in self._http_methods:
+            raise KeyError(http_method)
+
+        with self._lock:
+            if http_method not in self._operations:
+                operation_spec = self._path_spec[http_method]
+                ((_, operation),) = self._operations_generator.generate(
+                    self.path_name, {http_method: operation_spec}
+                )
+                operation_spec = self._dereferencer.dereference(operation_spec)
+                record_operation_examples(operation, operation_spec, self._dereferencer)
+                record_latency_threshold(operation, operation_spec)
+                self._operations[http_method] = operation
+            return self._operations[http_method]
+
+    def __iter__(self):
+        return iter(self._http_methods)
+
+    def __len__(self):
+        return len(self._http_methods)
+
+
+class OperationIndex:
+    """
+    Index of the operations in a specification by operationId, tag,
+    http method and path, built from the specification itself so that
+    operations can be found without creating them.
+    """
+
+    def __init__(self, paths_spec, dereferencer):
+        """
+        :param paths_spec: The dereferenced paths of the specification.
+        :param dereferencer: openapi_spec_validator Dereferencer.
+        """
+        self.keys = []
+        self.by_operation_id = {}
+        self.by_tag = defaultdict(list)
+        self.by_http_method = defaultdict(list)
+
+        for path_name, path_spec in paths_spec.items():
+            for http_method, operation_spec in dereferencer.dereference(path_spec).items():
+                if http_method in PathItemValidator.OPERATIONS:
+                    operation_spec = dereferencer.dereference(operation_spec)
+                    self._add((path_name, http_method), operation_spec)
+
+    def _add(self, key, operation_spec):
+        """
+        :param key: tuple of path name and http method of the operation.
+        :param operation_spec: The dereferenced specification of the
+                               operation.
+        """
+        self.keys.append(key)
+        self.by_http_method[key[1]].append(key)
+        if "operationId" in operation_spec:
+            self.by_operation_id[operation_spec["operationId"]] = key
+        for tag in operation_spec.get("tags", []):
+            self.by_tag[tag].append(key)
+
+    def select(self, operation_id=None, tag=None, method=None, path_prefix=None):
+        """
+        Select the operations which match all of the given criteria,
+        each of which is either a str or a collection of str of which
+        any may match.
+
+        :param operation_id: operationId of the operations.
+        :param tag: Tag of the operations.
+        :param method: http method of the operations.
+        :param path_prefix: Prefix of the paths of the operations.
+
+        :return: list of tuples of path name and http method, in the
+                 order of the specification.
+        """
+        selected = set(self.keys)
+        criteria = (
+            (operation_id, self._by_operation_id),
+            (tag, self._by_tag),
+            (method, self._by_http_method),
+            (path_prefix, self._by_path_prefix),
+        )
+        for values, select in criteria:
+            if values is not None:
+                selected &= select((values,) if isinstance(values, str) else tuple(values))
+        return [key for key in self.keys if key in selected]
+
+    def _by_operation_id(self, operation_ids):
+        """
+        :param operation_ids: tuple of operationId.
+
+        :return: set of the keys of the operations with any of them.
+        """
+        return {self.by_operation_id[x] for x in operation_ids if x in self.by_operation_id}
+
+    def _by_tag(self, tags):
+        """
+        :param tags: tuple of tags.
+
+        :return: set of the keys of the operations with any of them.
+        """
+        return set(concat(self.by_tag.get(x, ()) for x in tags))
+
+    def _by_http_method(self, methods):
+        """
+        :param methods: tuple of http methods, in any case.
+
+        :return: set of the keys of the operations with any of them.
+        """
+        return set(concat(self.by_http_method.get(x.lower(), ()) for x in methods))
+
+    def _by_path_prefix(self, path_prefixes):
+        """
+        :param path_prefixes: tuple of path prefixes.
+
+        :return: set of the keys of the operations whose path starts
+                 with any of them.
+        """
+        return {key for key in self.keys if key[0].startswith(path_prefixes)}
+
+
+class LazySpec(Spec):
+    """
+    openapi_core Spec whose operations (see LazyOperations) and
+    components are only created when they are first used, and which has
+    an OperationIndex to find operations without creating them.
+    """
+
+    def __init__(self, info, paths, servers, create_components, operation_index, lock):
+        """
+        :param info: openapi_core Info object.
+        :param paths: dict of path name to openapi_core Path objects.
+        :param servers: list of openapi_core Server objects.
+        :param create_components: Callable creating the openapi_core
+                                  Components object.
+        :param operation_index: OperationIndex of the specification.
+        :param lock: Lock held while creating the components.
+        """
+        self.info = info
+        self.paths = paths
+        self.servers = servers
+        self.operation_index = operation_index
+        self._create_components = create_components
+        self._components = None
+        self._lock = lock
+
+    @property
+    def components(self):
+        with self._lock:
+            if self._components is None:
+                self._components = self._create_components()
+            return self._components
+
+
+class InterningSpecFactory(SpecFactory):
+    """
+    SpecFactory which creates schemas using InterningSchemaRegistry,
+    and creates a LazySpec so that only the parts of the specification
+    which are used are created.
+    """
+
+    @property
+    @lru_cache()
+    def schemas_registry(self):
+        return InterningSchemaRegistry(self.dereferencer)
+
+    def create(self, spec_dict, spec_url=""):
+        if self.config.get("validate_spec", True):
+            openapi_v3_spec_validator.validate(spec_dict, spec_url=spec_url)
+
+        spec_dict_deref = self.dereferencer.dereference(spec_dict)
+        info = self.info_factory.create(spec_dict_deref.get("info", {}))
+        servers = list(self.servers_generator.generate(spec_dict_deref.get("servers", [])))
+        paths_spec = self.dereferencer.dereference(spec_dict_deref.get("paths", {}))
+        components_spec = spec_dict_deref.get("components", {})
+
+        # Everything which is created lazily is created holding the same
+        # lock as the schemas, since creating operations creates schemas.
+        lock = self.schemas_registry.lock
+        operations_generator = self.paths_generator.operations_generator
+        paths = {}
+        for path_name, path_spec in paths_spec.items():
+            path_spec = self.dereferencer.dereference(path_spec)
+            paths[path_name] = path = Path(path_name, [])
+            path.operations = LazyOperations(
+                path_name, path_spec, operations_generator, self.dereferencer, lock
+            )
+
+        return LazySpec(
+            info,
+            paths,
+            servers,
+            lambda: self.components_factory.create(components_spec),
+            OperationIndex(paths_spec, self.dereferencer),
+            lock,
+        )
+
+
+def create_spec(specification_path, validate_spec=True):
     """
     Helper wrapper around openapi_core.create_spec to enable creation of
-    specs from other types
+    specs from other types, and which keeps hold of the examples given
+    in the specification and interns schemas (see
+    InterningSchemaRegistry and record_operation_examples).
+
+    The operations and components of the specification are created
+    lazily, see InterningSpecFactory. Specifications ending in .json
+    are loaded as JSON, which is much faster than loading them as YAML.
 
     :param specification_path: Path to the specification to load.
+    :param validate_spec: When False the specification isn't validated,
+                          which saves time for large specifications
+                          which are known to be valid.
 
     :return: The created openapi_core Spec object.
     """
     with open(specification_path) as f:
-        specification = _create_spec(round_trip_load(f), f"file://{specification_path}")
-    return specification
+        if str(specification_path).endswith(".json"):
+            spec_dict = json.load(f)
+        else:
+            spec_dict = round_trip_load(f)
+    spec_url = f"file://{specification_path}"
+    dereferencer = Dereferencer(RefResolver(spec_url, spec_dict, handlers=default_handlers))
+    config = {"validate_spec": validate_spec}
+    return InterningSpecFactory(dereferencer, config).create(spec_dict, spec_url=spec_url)
+
+
+def select_operations(specification, **criteria):
+    """
+    Get the operations of the specification which match some criteria,
+    only these operations are created.
+
+    :param specification: openapi_core Spec object created by
+                          create_spec.
+    :param criteria: See OperationIndex.select.
+
+    :return: Generator yielding openapi_core Operation objects.
+    """
+    for path_name, http_method in specification.operation_index.select(**criteria):
+        yield specification[path_name].operations[http_method]
 
 
 def operations(specification):
@@ -183,24 +641,70 @@ def describe_operation(specification, operation):
     )
 
 
-def validate(validator, *args):
+def operation_fingerprint(specification, operation):
+    """
+    Get a fingerprint which identifies an operation across runs and
+    machines, e.g. to key the examples stored for it in a database.
+
+    :param specification: openapi_core Spec object.
+    :param operation: openapi_core Operation object.
+
+    :return: bytes containing the fingerprint.
+    """
+    return describe_operation(specification, operation).encode()
+
+
+def request_fingerprint(request):
+    """
+    Get a fingerprint which identifies a request, two requests have the
+    same fingerprint when they would be sent to the implementation in
+    the same way.
+
+    Only a digest of the body is part of the fingerprint, so that
+    holding on to fingerprints doesn't hold on to large bodies. The
+    digest is taken of request.body, which an EncodedRequest encodes
+    once and then reuses when the request is sent.
+
+    :param request: openapi_core BaseOpenAPIRequest
+
+    :return: Hashable fingerprint of the request.
+    """
+    body = request.body
+    body = hashlib.sha256(body.encode() if isinstance(body, str) else body)
+    parameters = {
+        location: values.to_dict(flat=False) if hasattr(values, "to_dict") else values
+        for location, values in request.parameters.items()
+    }
+    return (
+        request.method,
+        request.full_url_pattern,
+        json.dumps(parameters, sort_keys=True, default=repr),
+        body.digest(),
+        request.mimetype,
+    )
+
+
+def validate(validator, *args, codecs=None):
     """
 
     :param validator:
     :param args:
+    :param codecs: dict of mime type to Codec used to decode bodies,
+                   defaults to openapi_conformance.codecs.CODECS.
     :return:
     """
     with record_unmarshal() as log:
         with strict_str():
             with strict_bool():
                 with patch_schema_validate():
-                    with patch_media_type_deserializers():
-                        result = validator.validate(*args)
-                        try:
-                            result.raise_for_errors()
-                        except Exception as e:
-                            e.unmarshal_log = log
-                            raise e
+                    with patch_request_body_values():
+                        with patch_media_type_deserializers(codecs):
+                            result = validator.validate(*args)
+                            try:
+                                result.raise_for_errors()
+                            except Exception as e:
+                                e.unmarshal_log = log
+                                raise e
 
 
 @contextlib.contextmanager
@@ -218,30 +722,74 @@ def patch_schema_validate():
     and we should just let the custom format determine if the value
     is valid or not.
     """
-    original = copy.deepcopy(Schema.validate)
+    original = Schema.validate
 
     def validate(self, value, custom_formatters=None):
         is_custom_formatted = self.format in (custom_formatters or {})
         return value if is_custom_formatted else original(self, value, custom_formatters)
 
-    target = "openapi_core.schema.schemas.models.Schema.validate"
-    with patch(target, validate):
+    with patch_attribute(Schema, "validate", validate):
         yield
 
 
+# The value of the body of an EncodedRequest, see patch_request_body_values.
+DecodedBody = namedtuple("DecodedBody", "value")
+
+
 @contextlib.contextmanager
-def patch_media_type_deserializers():
+def patch_request_body_values():
     """
-    Patch MEDIA_TYPE_DESERIALIZERS to provide a custom deserializer
-    for application/x-www-form-urlencoded, perhaps there should be a
-    nice way to provide custom deserializers in openapi_cor
+    Patch RequestBody.get_value to get the body of an EncodedRequest as
+    the value it was encoded from, rather than encoding the whole body
+    only for it to be decoded again when validating the request.
     """
+    original = RequestBody.get_value
 
-    def urldecode(qs):
-        return dict(map(unquote_plus, x.split("=")) for x in qs.decode().split("&"))
+    def get_value(self, request):
+        if isinstance(request, EncodedRequest) and request.value is not None:
+            return DecodedBody(request.value)
+        return original(self, request)
 
-    patched = {**MEDIA_TYPE_DESERIALIZERS, "application/x-www-form-urlencoded": urldecode}
+    with patch_attribute(RequestBody, "get_value", get_value):
+        yield
 
-    target = "openapi_core.schema.media_types.models.MEDIA_TYPE_DESERIALIZERS"
-    with patch(target, patched):
+
+def _decoded_or(deserializer):
+    """
+    :param deserializer: Callable deserializing an encoded body.
+
+    :return: Callable which deserializes encoded bodies, and returns
+             the value of a DecodedBody as is.
+    """
+
+    def deserialize(body):
+        return body.value if isinstance(body, DecodedBody) else deserializer(body)
+
+    return deserialize
+
+
+@contextlib.contextmanager
+def patch_media_type_deserializers(codecs=None):
+    """
+    Patch MediaType.get_deserializer_mapping to deserialize bodies using
+    the same codecs which encode them, e.g. for
+    application/x-www-form-urlencoded, perhaps there should be a nice
+    way to provide custom deserializers in openapi_core. The codecs are
+    given the schema of the media type, e.g. so that arrays in forms
+    are decoded as lists however many items they have.
+
+    :param codecs: dict of mime type to Codec, defaults to CODECS.
+    """
+    codecs = codecs or CODECS
+    original = MediaType.get_deserializer_mapping
+
+    def get_deserializer_mapping(self):
+        mapping = original(self)
+        for mime_type, codec in codecs.items():
+            mapping[mime_type] = partial(codec.decode, schema=self.schema)
+        return defaultdict(
+            lambda: _decoded_or(mapping.default_factory()), valmap(_decoded_or, mapping)
+        )
+
+    with patch_attribute(MediaType, "get_deserializer_mapping", get_deserializer_mapping):
         yield
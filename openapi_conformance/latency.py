@@ -0,0 +1,212 @@
+# std
+import heapq
+import itertools
+import time
+from collections import namedtuple
+from operator import attrgetter
+
+# 3rd party
+from hypothesis import HealthCheck, Verbosity, given, settings, target
+from hypothesis.errors import Flaky
+
+# openapi_conformance
+from openapi_conformance.extension import describe_operation
+
+SlowRequest = namedtuple("SlowRequest", "latency request response_size")
+
+# Slow requests are shrunk to minimal requests which take at least this
+# fraction of their latency, as latency is too noisy to ask for all of it.
+SHRINK_FRACTION = 0.8
+
+
+class LatencyThresholdExceeded(Exception):
+    """
+    Raised when the implementation of an operation takes longer than its
+    latency threshold to respond.
+    """
+
+
+class LatencyReport:
+    """
+    Report of the slowest requests found for a single operation by
+    seek_latency.
+    """
+
+    def __init__(self, name, operation, threshold, slowest, exceeded):
+        """
+        :param name: Human readable description of the operation.
+        :param operation: openapi_core Operation object.
+        :param threshold: The latency threshold in seconds, or None.
+        :param slowest: list of SlowRequest, with the minimal requests
+                        the slowest requests shrank to, slowest first.
+        :param exceeded: SlowRequest with the minimal request which
+                         exceeded the threshold, or None.
+        """
+        self.name = name
+        self.operation = operation
+        self.threshold = threshold
+        self.slowest = slowest
+        self.exceeded = exceeded
+
+    def __str__(self):
+        threshold = "-" if self.threshold is None else f"{1000 * self.threshold:.1f} ms"
+        lines = [f"{self.name} (threshold {threshold})"]
+        for slow in self.slowest:
+            lines.append(f"  {1000 * slow.latency:>8.1f} ms  {describe_request(slow.request)}")
+        if self.exceeded:
+            lines.append(
+                f"  exceeded in {1000 * self.exceeded.latency:.1f} ms  "
+                f"{describe_request(self.exceeded.request)}"
+            )
+        return "\n".join(lines)
+
+
+def describe_request(request):
+    """
+    :param request: openapi_core BaseOpenAPIRequest.
+
+    :return: Short human readable description of a request.
+    """
+    parameters = _parameters(request)
+    body = request.body
+    if len(body) > 80:
+        body = body[:77] + (b"..." if isinstance(body, bytes) else "...")
+    return f"{parameters} {body!r}" if body else str(parameters)
+
+
+def _parameters(request):
+    """
+    :param request: openapi_core BaseOpenAPIRequest.
+
+    :return: dict of location to dict of name to value, of the locations
+             in which the request has parameters.
+    """
+    parameters = {location: dict(values) for location, values in request.parameters.items()}
+    return {location: values for location, values in parameters.items() if values}
+
+
+def time_request(conformance, operation, request_values):
+    """
+    Send a request to the implementation of an operation, timing how
+    long it takes to respond.
+
+    :param conformance: OpenAPIConformance whose implementation to
+                        send the request to.
+    :param operation: openapi_core Operation object.
+    :param request_values: RequestValues to create the request from.
+
+    :return: SlowRequest.
+    """
+    request = conformance._create_request(operation, *request_values)
+    start = time.perf_counter()
+    response = conformance.send_request(operation, request)
+    latency = time.perf_counter() - start
+    return SlowRequest(latency, request, len(response.data or b""))
+
+
+def search_latency(conformance, operation, threshold, response_size=False, on_request=None):
+    """
+    Search for requests to which the implementation of an operation is
+    slow to respond, using hypothesis' targeted search to maximise the
+    latency of send_request.
+
+    Requests which take longer than the threshold fail the search, so
+    that hypothesis shrinks them to a minimal request which still
+    exceeds the threshold. Latency is noisy, so the minimal request is
+    the last one seen to exceed the threshold, even when hypothesis
+    fails to reproduce it.
+
+    :param conformance: OpenAPIConformance whose implementation to
+                        send the requests to.
+    :param operation: openapi_core Operation object.
+    :param threshold: Latency threshold in seconds, or None.
+    :param response_size: When True the size of the response is also
+                          maximised.
+    :param on_request: Callable called with the SlowRequest of each
+                       request sent, or None.
+
+    :return: SlowRequest with the minimal request which exceeded the
+             threshold, or None.
+    """
+    exceeded = None
+
+    @given(conformance.st.requests(operation))
+    @settings(
+        database=None,
+        deadline=None,
+        suppress_health_check=[HealthCheck.too_slow],
+        verbosity=Verbosity.quiet,
+    )
+    def do_test(request_values):
+        nonlocal exceeded
+        slow = time_request(conformance, operation, request_values)
+
+        target(slow.latency, label="latency")
+        if response_size:
+            target(float(slow.response_size), label="response size")
+        if on_request is not None:
+            on_request(slow)
+
+        if threshold is not None and slow.latency > threshold:
+            # Hypothesis replays the minimal failing example last.
+            exceeded = slow
+            raise LatencyThresholdExceeded(f"{slow.latency:.3f}s > {threshold:.3f}s")
+
+    try:
+        do_test()
+    except (LatencyThresholdExceeded, Flaky):
+        # Flaky when the minimal request wasn't slow when replayed.
+        if exceeded is None:
+            raise
+
+    return exceeded
+
+
+def seek_latency(conformance, operation, threshold=None, slowest=5, response_size=False):
+    """
+    Search for the requests to which the implementation of an operation
+    is slowest to respond, see search_latency.
+
+    Once the search is done the slowest requests are shrunk too, by
+    searching again for each one with a threshold of SHRINK_FRACTION
+    of its latency. A slow request is reported as it was generated when
+    the search finds no request as slow. The slowest requests often
+    shrink to the same minimal request, which is only reported once.
+
+    The number of requests sent by each search is taken from the
+    current hypothesis settings, targeting works better with more
+    examples.
+
+    :param conformance: OpenAPIConformance whose implementation to
+                        send the requests to.
+    :param operation: openapi_core Operation object.
+    :param threshold: Latency threshold in seconds, or None.
+    :param slowest: The number of slowest requests to report.
+    :param response_size: When True the size of the response is also
+                          maximised.
+
+    :return: LatencyReport.
+    """
+    counter = itertools.count()
+    heap = []  # min heap of the slowest requests, by latency
+
+    def on_request(slow):
+        heapq.heappush(heap, (slow.latency, next(counter), slow))
+        if len(heap) > slowest:
+            heapq.heappop(heap)
+
+    exceeded = search_latency(conformance, operation, threshold, response_size, on_request)
+
+    minimal_requests = {}
+    for _, _, slow in sorted(heap, reverse=True):
+        minimal = search_latency(conformance, operation, SHRINK_FRACTION * slow.latency) or slow
+        key = (repr(_parameters(minimal.request)), minimal.request.body)
+        minimal_requests.setdefault(key, minimal)
+
+    return LatencyReport(
+        describe_operation(conformance.specification, operation),
+        operation,
+        threshold,
+        sorted(minimal_requests.values(), key=attrgetter("latency"), reverse=True),
+        exceeded,
+    )
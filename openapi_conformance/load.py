@@ -0,0 +1,304 @@
+# std
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 3rd party
+from hypothesis import HealthCheck, Phase, Verbosity, given, settings
+from hypothesis import strategies as st
+
+# openapi_conformance
+from openapi_conformance.extension import describe_operation
+
+
+def percentile(values, p):
+    """
+    Get the p-th percentile of some values using the nearest rank
+    method.
+
+    >>> percentile([4, 1, 3, 2], 50)
+    2
+
+    :param values: The values to get the percentile of.
+    :param p: The percentile to get, between 0 and 100.
+
+    :return: The percentile or None when there are no values.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    rank = max(1, -(-len(values) * p // 100))
+    return values[int(rank) - 1]
+
+
+class OperationLoad:
+    """
+    Statistics of the load generated for a single operation.
+    """
+
+    def __init__(self, name):
+        """
+        :param name: Human readable description of the operation.
+        """
+        self.name = name
+        self.latencies = []
+        self.errors = 0
+        self.validated = 0
+        self.failures = 0
+        self.duration = 0.0
+
+    @property
+    def requests(self):
+        """
+        :return: The number of requests sent.
+        """
+        return len(self.latencies) + self.errors
+
+    @property
+    def throughput(self):
+        """
+        :return: The number of requests sent per second.
+        """
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def failure_rate(self):
+        """
+        :return: Fraction of the validated responses which did not
+                 conform to the specification.
+        """
+        return self.failures / self.validated if self.validated else 0.0
+
+    def latency(self, p):
+        """
+        :param p: The percentile to get, between 0 and 100.
+
+        :return: The p-th percentile latency in seconds.
+        """
+        return percentile(self.latencies, p)
+
+
+class LoadReport:
+    """
+    Report of the load generated by generate_load.
+    """
+
+    def __init__(self, duration, operations):
+        """
+        :param duration: How long the load was generated for in seconds.
+        :param operations: dict of openapi_core Operation to
+                           OperationLoad.
+        """
+        self.duration = duration
+        self.operations = operations
+        for load in operations.values():
+            load.duration = duration
+
+    @property
+    def requests(self):
+        """
+        :return: The total number of requests sent.
+        """
+        return sum(load.requests for load in self.operations.values())
+
+    @property
+    def throughput(self):
+        """
+        :return: The number of requests sent per second.
+        """
+        return self.requests / self.duration if self.duration else 0.0
+
+    def __str__(self):
+        def ms(seconds):
+            return "-" if seconds is None else f"{1000 * seconds:.1f}"
+
+        lines = [
+            f"{'operation':<40} {'requests':>8} {'req/s':>8} {'errors':>6} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'validated':>9} {'failures':>8}"
+        ]
+        for load in self.operations.values():
+            lines.append(
+                f"{load.name:<40} {load.requests:>8} {load.throughput:>8.1f} {load.errors:>6} "
+                f"{ms(load.latency(50)):>8} {ms(load.latency(95)):>8} {ms(load.latency(99)):>8} "
+                f"{load.validated:>9} {100 * load.failure_rate:>7.1f}%"
+            )
+        lines.append(f"{self.requests} requests in {self.duration:.1f}s, {self.throughput:.1f}/s")
+        return "\n".join(lines)
+
+
+class _Stop(Exception):
+    """
+    Raised to stop hypothesis from generating any more requests.
+    """
+
+
+class _LoadGenerator:
+    """
+    Generates requests for the operations of a specification and sends
+    them to the implementation, keeping the statistics of each
+    operation. See generate_load.
+    """
+
+    def __init__(self, conformance, operation_weights, rate, concurrency, validate, seed):
+        """
+        :param conformance: OpenAPIConformance to generate load for.
+        :param operation_weights: dict of openapi_core Operation to the
+                                  relative weight of that operation.
+        :param rate: The number of requests to send per second, or None.
+        :param concurrency: The maximum number of requests in flight.
+        :param validate: Fraction of the responses to validate.
+        :param seed: Seed for choosing which responses to validate.
+        """
+        self.conformance = conformance
+        self.operations = list(operation_weights)
+        self.weights = list(operation_weights.values())
+        self.rate = rate
+        self.validate = validate
+        self.loads = {
+            operation: OperationLoad(describe_operation(conformance.specification, operation))
+            for operation in self.operations
+        }
+        self.rng = random.Random(seed)
+        self.in_flight = threading.BoundedSemaphore(concurrency)
+        self.responses = queue.Queue()
+        self.next_send = self.end = None
+
+    def send(self, operation, request):
+        """
+        Send a request to the implementation, this is run on the thread
+        pool, the response is queued for check_responses.
+
+        :param operation: openapi_core Operation object.
+        :param request: The request to send.
+        """
+        try:
+            start = time.perf_counter()
+            response = self.conformance.send_request(operation, request)
+            self.responses.put((operation, request, response, time.perf_counter() - start))
+        except Exception:
+            self.responses.put((operation, request, None, None))
+        finally:
+            self.in_flight.release()
+
+    def check_responses(self):
+        """
+        Record the statistics of, and validate a fraction of, the
+        responses received so far.
+        """
+        while True:
+            try:
+                operation, request, response, latency = self.responses.get_nowait()
+            except queue.Empty:
+                return
+            load = self.loads[operation]
+            if response is None:
+                load.errors += 1
+                continue
+            load.latencies.append(latency)
+            if self.rng.random() < self.validate:
+                load.validated += 1
+                try:
+                    self.conformance.check_response(request, response)
+                except Exception:
+                    load.failures += 1
+
+    def generate_request(self, data, executor):
+        """
+        Generate a request for a randomly chosen operation and submit it
+        to be sent once the rate allows.
+
+        :param data: Data strategy for interactively drawing examples.
+        :param executor: ThreadPoolExecutor to send the request on.
+        """
+        self.check_responses()
+
+        # Everything which is drawn has to depend only on the data
+        # drawn from hypothesis, otherwise it considers generation
+        # to be flaky, that's why we only stop once drawn.
+        choice = random.Random(data.draw(st.integers(0, 2 ** 32 - 1)))
+        (operation,) = choice.choices(self.operations, self.weights)
+        request_values = data.draw(self.conformance.st.requests(operation))
+        if time.perf_counter() >= self.end:
+            raise _Stop()
+        request = self.conformance._create_request(operation, *request_values)
+
+        if self.rate:
+            self.next_send += 1 / self.rate
+            time.sleep(max(0.0, self.next_send - time.perf_counter()))
+        self.in_flight.acquire()
+        executor.submit(self.send, operation, request)
+
+    def run(self, duration, concurrency):
+        """
+        :param duration: How long to generate load for in seconds.
+        :param concurrency: The maximum number of requests in flight.
+
+        :return: LoadReport.
+        """
+        start = self.next_send = time.perf_counter()
+        self.end = start + duration
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+            @given(st.data())
+            @settings(
+                max_examples=10 ** 9,
+                database=None,
+                deadline=None,
+                phases=[Phase.generate],
+                suppress_health_check=HealthCheck.all(),
+                verbosity=Verbosity.quiet,
+            )
+            def generate(data):
+                self.generate_request(data, executor)
+
+            # Hypothesis stops once it has exhausted the examples it can
+            # generate, which happens quickly for operations with few
+            # parameters, so keep going until the duration has elapsed.
+            while time.perf_counter() < self.end:
+                try:
+                    generate()
+                except _Stop:
+                    break
+
+        self.check_responses()
+        return LoadReport(time.perf_counter() - start, self.loads)
+
+
+def generate_load(
+    conformance, duration, rate=None, concurrency=1, weights=None, validate=0.1, seed=None
+):
+    """
+    Send generated requests to an implementation for a given duration
+    and report on the latency, throughput and conformance of the
+    responses for each operation.
+
+    Requests are generated in the calling thread and sent using
+    conformance.send_request on a pool of concurrency threads. The
+    responses which are validated are also validated in the calling
+    thread.
+
+    :param conformance: OpenAPIConformance to generate load for.
+    :param duration: How long to generate load for in seconds.
+    :param rate: The number of requests to send per second, or None to
+                 send requests as fast as the concurrency allows.
+    :param concurrency: The maximum number of requests in flight.
+    :param weights: dict of openapi_core Operation or operationId to
+                    the relative weight with which to choose that
+                    operation, operations not in weights have a weight
+                    of 1. Operations are chosen using data drawn by
+                    hypothesis, so the weights are only approximate.
+    :param validate: Fraction of the responses to validate.
+    :param seed: Seed for choosing which responses to validate.
+
+    :return: LoadReport.
+    """
+    weights = weights or {}
+    operation_weights = {
+        operation: weights.get(operation, weights.get(operation.operation_id, 1))
+        for operation in conformance.operations
+    }
+    generator = _LoadGenerator(conformance, operation_weights, rate, concurrency, validate, seed)
+    return generator.run(duration, concurrency)
@@ -0,0 +1,321 @@
+"""
+Generation of strings which fully match a regular expression and whose
+length is within given limits. The length is drawn first and then
+distributed over the parts of the regular expression, rather than
+filtering the strings generated by st.from_regex, which hardly ever
+generates strings of lengths the regular expression itself doesn't
+require.
+"""
+
+# std
+import math
+import re
+from functools import lru_cache
+from itertools import accumulate
+
+# 3rd party
+from hypothesis import reject
+from hypothesis import strategies as st
+
+try:
+    from re import _parser as sre_parse  # type: ignore
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+INF = float("inf")
+
+# How much longer than their minimum length strings are allowed to be
+# when neither the regular expression nor the schema limits them.
+MAX_EXTRA_LENGTH = 64
+
+CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: r"\d",
+    sre_parse.CATEGORY_NOT_DIGIT: r"\D",
+    sre_parse.CATEGORY_SPACE: r"\s",
+    sre_parse.CATEGORY_NOT_SPACE: r"\S",
+    sre_parse.CATEGORY_WORD: r"\w",
+    sre_parse.CATEGORY_NOT_WORD: r"\W",
+}
+
+ANCHORS = {
+    sre_parse.AT_BEGINNING,
+    sre_parse.AT_BEGINNING_STRING,
+    sre_parse.AT_END,
+    sre_parse.AT_END_STRING,
+}
+
+REPEATS = {
+    sre_parse.MAX_REPEAT,
+    sre_parse.MIN_REPEAT,
+    getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT),
+}
+
+
+class Unsupported(Exception):
+    """
+    Raised for regular expressions using constructs which can't be
+    generated with a given length, e.g. backreferences.
+    """
+
+
+class Node:
+    """
+    Part of a regular expression, which generates the strings of a
+    given length that match it. This is an empty part, e.g. an anchor.
+    """
+
+    min_width = max_width = 0
+
+    def draw(self, draw, length):
+        """
+        :param draw: Callable to draw examples from other strategies.
+        :param length: The length of the string, between min_width and
+                       max_width.
+
+        :return: str of length matching this part.
+        """
+        return ""
+
+
+class Character(Node):
+    """
+    Part of a regular expression matching a single character.
+    """
+
+    min_width = max_width = 1
+
+    def __init__(self, regex):
+        """
+        :param regex: Regular expression matching the character.
+        """
+        self.strategy = st.from_regex(regex, fullmatch=True)
+
+    def draw(self, draw, length):
+        return draw(self.strategy)
+
+
+def _suffix_sums(values):
+    """
+    >>> _suffix_sums([1, 2, 3])
+    [5, 3, 0]
+
+    :param values: list of numbers.
+
+    :return: list with the sum of the values following each value.
+    """
+    sums = list(accumulate(reversed(values)))[::-1]
+    return sums[1:] + [0]
+
+
+class Sequence(Node):
+    """
+    Parts of a regular expression which follow each other.
+    """
+
+    def __init__(self, nodes):
+        """
+        :param nodes: list of Node.
+        """
+        self.nodes = nodes
+        # The widths of the nodes following each node.
+        self.rest_min_widths = _suffix_sums([node.min_width for node in nodes])
+        self.rest_max_widths = _suffix_sums([node.max_width for node in nodes])
+        self.min_width = sum(node.min_width for node in nodes)
+        self.max_width = sum(node.max_width for node in nodes)
+
+    def draw(self, draw, length):
+        parts = []
+        for node, rest_min, rest_max in zip(self.nodes, self.rest_min_widths, self.rest_max_widths):
+            lo = max(node.min_width, length - rest_max)
+            hi = min(node.max_width, length - rest_min)
+            if lo > hi:
+                reject()
+            part_length = draw(st.integers(lo, hi))
+            parts.append(node.draw(draw, part_length))
+            length -= part_length
+        return "".join(parts)
+
+
+class Branch(Node):
+    """
+    Alternatives in a regular expression.
+    """
+
+    def __init__(self, nodes):
+        """
+        :param nodes: list of Node, one for each alternative.
+        """
+        self.nodes = nodes
+        self.min_width = min(node.min_width for node in nodes)
+        self.max_width = max(node.max_width for node in nodes)
+
+    def draw(self, draw, length):
+        nodes = [node for node in self.nodes if node.min_width <= length <= node.max_width]
+        if not nodes:
+            reject()
+        return draw(st.sampled_from(nodes)).draw(draw, length)
+
+
+class Repeat(Node):
+    """
+    Part of a regular expression which is repeated.
+    """
+
+    def __init__(self, min_count, max_count, node):
+        """
+        :param min_count: The minimum number of repetitions.
+        :param max_count: The maximum number of repetitions, or INF.
+        :param node: The Node which is repeated.
+        """
+        self.min_count = min_count
+        self.max_count = max_count
+        self.node = node
+        self.min_width = min_count * node.min_width
+        self.max_width = max_count * node.max_width if node.max_width else 0
+
+    def draw(self, draw, length):
+        node = self.node
+        lo = self.min_count
+        if node.max_width:
+            lo = max(lo, math.ceil(length / node.max_width))
+        if node.min_width:
+            hi = min(self.max_count, length // node.min_width)
+        else:
+            hi = min(self.max_count, max(self.min_count, length))
+        if lo > hi:
+            reject()
+        count = draw(st.integers(lo, hi))
+        return Sequence([node] * count).draw(draw, length)
+
+
+def _character_class(items):
+    """
+    :param items: The parsed items of a character class.
+
+    :return: str containing a regular expression for the class.
+    """
+    parts = []
+    for op, av in items:
+        if op == sre_parse.NEGATE:
+            parts.append("^")
+        elif op == sre_parse.LITERAL:
+            parts.append(re.escape(chr(av)))
+        elif op == sre_parse.RANGE:
+            parts.append(f"{re.escape(chr(av[0]))}-{re.escape(chr(av[1]))}")
+        elif op == sre_parse.CATEGORY and av in CATEGORIES:
+            parts.append(CATEGORIES[av])
+        else:
+            raise Unsupported(op)
+    return f"[{''.join(parts)}]"
+
+
+def _character(op, av):
+    """
+    :param op: The parsed operation.
+    :param av: The arguments of the operation.
+
+    :return: Character for single character operations, otherwise None.
+    """
+    if op == sre_parse.LITERAL:
+        return Character(re.escape(chr(av)))
+    if op == sre_parse.NOT_LITERAL:
+        return Character(f"[^{re.escape(chr(av))}]")
+    if op == sre_parse.ANY:
+        return Character(".")
+    if op == sre_parse.IN:
+        return Character(_character_class(av))
+    if op == sre_parse.CATEGORY and av in CATEGORIES:
+        return Character(CATEGORIES[av])
+    return None
+
+
+def _node(op, av):
+    """
+    :param op: The parsed operation.
+    :param av: The arguments of the operation.
+
+    :return: Node generating strings for the operation.
+    """
+    character = _character(op, av)
+    if character is not None:
+        return character
+    if op == sre_parse.AT and av in ANCHORS:
+        return Node()
+    if op == sre_parse.SUBPATTERN:
+        return _sequence(av[-1])
+    if op == getattr(sre_parse, "ATOMIC_GROUP", None):
+        return _sequence(av)
+    if op == sre_parse.BRANCH:
+        return Branch([_sequence(items) for items in av[1]])
+    if op in REPEATS:
+        min_count, max_count, items = av
+        max_count = INF if max_count == sre_parse.MAXREPEAT else max_count
+        return Repeat(min_count, max_count, _sequence(items))
+    raise Unsupported(op)
+
+
+def _sequence(items):
+    """
+    :param items: Parsed regular expression.
+
+    :return: Sequence of the nodes of the items.
+    """
+    return Sequence([_node(op, av) for op, av in items])
+
+
+@lru_cache(maxsize=None)
+def _parse(pattern):
+    """
+    Parse a regular expression in to nodes, which is cached per pattern
+    so that strategies for the same pattern with different length
+    limits share the nodes, and the strategies for their characters.
+
+    :param pattern: Compiled regular expression.
+
+    :return: Sequence of the nodes of the pattern, or None when the
+             pattern uses constructs which aren't supported.
+    """
+    try:
+        return _sequence(sre_parse.parse(pattern.pattern, pattern.flags))
+    except Unsupported:
+        return None
+
+
+def st_regex_strings(pattern, min_length=0, max_length=None):
+    """
+    Strategy for generating strings which fully match a regular
+    expression and are within the given length limits. Regular
+    expressions using constructs other than characters, character
+    classes, groups, alternatives, repeats and the ^ and $ anchors are
+    generated using st.from_regex and filtered by length instead.
+
+    Only parsing the pattern is cached, so strategies can be created
+    cheaply for length limits which change, e.g. with a Budget.
+
+    :param pattern: The regex pattern, either a str or compiled pattern.
+    :param min_length: The minimum length of the generated strings.
+    :param max_length: The maximum length of the generated strings, or
+                       None for no maximum.
+
+    :return: Strategy which generates strings matching pattern.
+    """
+    pattern = re.compile(pattern)
+    max_length = INF if max_length is None else max_length
+    root = _parse(pattern)
+    if root is None:
+        return st.from_regex(pattern, fullmatch=True).filter(
+            lambda x: min_length <= len(x) <= max_length
+        )
+
+    lo = max(min_length, root.min_width)
+    hi = min(max_length, root.max_width, lo + MAX_EXTRA_LENGTH)
+    if lo > hi:
+        return st.nothing()
+
+    @st.composite
+    def strings(draw):
+        return root.draw(draw, draw(st.integers(lo, hi)))
+
+    # Anchors and flags aren't taken into account when generating, so
+    # make sure the whole string matches, which it hardly ever won't.
+    return strings().filter(pattern.fullmatch)
@@ -1,16 +1,44 @@
 # std
 import base64
+import json
+import math
+import random
 from collections import namedtuple
 from datetime import datetime
-from functools import partial
+from functools import lru_cache, partial
+from typing import Dict, Tuple
 from urllib.parse import quote_plus
 
 # 3rd party
+import hypothesis
+from hypothesis import HealthCheck, Phase, Verbosity, given, settings
 from hypothesis import strategies as st
+from hypothesis.errors import Unsatisfiable
 from openapi_core.schema.schemas.enums import SchemaType
-from toolz import curry, keyfilter, unique, valmap
+from openapi_core.schema.schemas.models import Schema
+from toolz import curry, first, keyfilter, unique, valmap
+
+# openapi_conformance
+from openapi_conformance.regex import st_regex_strings
 
 ParameterValue = namedtuple("ParameterValue", "parameter value")
+RequestValues = namedtuple("RequestValues", "parameters request_body mime_type")
+
+# (format strategies, schema) -> strategy, see Strategies._strategy_for_schema
+_schema_strategies: Dict[Tuple[tuple, Schema], st.SearchStrategy] = {}
+
+# ConjectureData is internal to hypothesis, so draw_examples only uses
+# it with the versions of hypothesis it has been checked against.
+if (4, 38) <= hypothesis.__version_info__ < (5,):
+    from hypothesis.errors import StopTest
+    from hypothesis.internal.conjecture.data import ConjectureData
+else:  # pragma: no cover
+    ConjectureData = None  # type: ignore
+
+# Size of the random buffers values are drawn from, and how many draws
+# in a row may be rejected before giving up, see draw_examples.
+DRAW_BUFFER_SIZE = 8 * 1024
+MAX_REJECTED_DRAWS = 1000
 
 
 @st.composite
@@ -31,53 +59,305 @@ def st_filtered_containers(draw, container):
     return type(container)(result)
 
 
-@st.composite
-def st_hostnames(draw):
+@lru_cache(maxsize=None)
+def st_pattern_strings(pattern, min_length=0, max_length=None):
     """
+    Strategy for generating strings which match a pattern, the whole
+    string matches the pattern so that there is no arbitrary text around
+    the match for the implementation to choke on. Length limits are
+    taken into account while generating, see st_regex_strings.
 
-    :param draw:
+    Building a regex strategy is not cheap, so strategies are cached
+    per process for each pattern and length constraint.
 
-    :return:
+    :param pattern: The regex pattern, either a str or compiled pattern.
+    :param min_length: The minimum length of the generated strings.
+    :param max_length: The maximum length of the generated strings, or
+                       None for no maximum.
+
+    :return: Strategy which generates strings matching pattern.
     """
-    return draw(
-        st.from_regex(r"(?!-)[a-z0-9-]{1,63}(?<!-)$").filter(lambda x: len(x) and len(x) < 253)
-    )
+    if min_length or max_length is not None:
+        return st_regex_strings(pattern, min_length, max_length)
+    return st.from_regex(pattern, fullmatch=True)
 
 
 @st.composite
-def st_uris(draw):
+def st_hostnames(draw, min_size=0, max_size=None):
     """
+    Generate a hostname, which is a label of 1 to 63 letters, digits or
+    hyphens that doesn't start or end with a hyphen.
 
-    :param draw:
+    :param draw: Callable to draw examples from other strategies.
+    :param min_size: The minimum length of the hostname.
+    :param max_size: The maximum length of the hostname, or None.
 
-    :return:
+    :return: str containing the hostname.
     """
-    scheme = draw(st.sampled_from(("ftp", "http", "file", "custom")))
+    min_size = min(min_size, 63)
+    if max_size is not None:
+        max_size = max(min_size, 1, min(max_size, 63))
+    return draw(st_pattern_strings(r"[a-z0-9]([a-z0-9-]{0,61}[a-z0-9])?", min_size, max_size))
 
-    userinfo = query = fragment = password = port = ""
 
-    if draw(st.booleans()):  # userinfo
-        username = quote_plus(draw(st.text()))
-        if draw(st.booleans()):  # password
-            password = ":" + quote_plus(draw(st.text()))
-        userinfo = f"{username}{password}"
-    host = draw(st_hostnames())
-    if draw(st.booleans()):  # port
+def _draw_quoted(draw, max_size, min_size=0):
+    """
+    :param draw: Callable to draw examples from other strategies.
+    :param max_size: The maximum length of the text once percent
+                     encoded, or math.inf.
+    :param min_size: The minimum number of characters of the text.
+
+    :return: str containing percent encoded text.
+    """
+    # Characters take up to 12 bytes once percent encoded.
+    max_size = None if max_size == math.inf else max(min_size, int(max_size) // 12)
+    return quote_plus(draw(st.text(min_size=min_size, max_size=max_size)))
+
+
+@st.composite
+def st_authorities(draw, max_size=math.inf):
+    """
+    Generate the authority of a URI, which is a hostname with optional
+    userinfo and port.
+
+    :param draw: Callable to draw examples from other strategies.
+    :param max_size: The maximum length of the authority, or math.inf.
+
+    :return: str containing the authority, starting with //.
+    """
+    remaining = max_size - len("//")
+    host = draw(st_hostnames(max_size=None if remaining == math.inf else remaining))
+    remaining -= len(host)
+
+    userinfo = port = ""
+    if remaining > 1 and draw(st.booleans()):  # userinfo
+        userinfo = _draw_quoted(draw, remaining - 1)
+        if remaining - len(userinfo) > 2 and draw(st.booleans()):  # password
+            userinfo += ":" + _draw_quoted(draw, remaining - len(userinfo) - 2)
+        userinfo += "@"
+        remaining -= len(userinfo)
+    if remaining > 6 and draw(st.booleans()):  # port
         port = f":{draw(st.integers(min_value=0, max_value=65535))}"
-    authority = f"//{userinfo}{host}{port}"
 
-    if draw(st.booleans()):  # query
-        pass
+    return f"//{userinfo}{host}{port}"
+
+
+@st.composite
+def st_uris(draw, min_size=0, max_size=None):
+    """
+    Generate an absolute URI with an authority and a path, whose parts
+    are percent encoded.
 
-    if draw(st.booleans()):  # fragment
-        pass
+    :param draw: Callable to draw examples from other strategies.
+    :param min_size: The minimum length of the URI.
+    :param max_size: The maximum length of the URI, or None. URIs are
+                     only longer when the shortest URI is.
 
-    st_path_part = st.text(min_size=1).map(quote_plus)
-    st_path_parts = st.lists(st_path_part, min_size=1)
-    path_parts = draw(st_path_parts)
+    :return: str containing the URI.
+    """
+    scheme = draw(st.sampled_from(("ftp", "http", "file", "custom")))
+    remaining = math.inf if max_size is None else max_size - len(f"{scheme}:/")
+    authority = draw(st_authorities(remaining))
+    remaining -= len(authority)
+
+    # The first part of the path makes up for the minimum length.
+    path_parts = [_draw_quoted(draw, remaining, max(1, min_size - len(f"{scheme}:{authority}/")))]
+    remaining -= len(path_parts[0])
+    while remaining > 1 and draw(st.booleans()):
+        path_parts.append(_draw_quoted(draw, remaining - 1, 1))
+        remaining -= len(path_parts[-1]) + 1
     path = "/".join(path_parts)
 
-    return f"{scheme}:{authority}{path}{query}{fragment}"
+    return f"{scheme}:{authority}/{path}"
+
+
+def st_budgeted_pattern_strings(schema, budgeted_max_length=None):
+    """
+    Strategy for generating strings which match the pattern of a
+    schema, within what is left of a budget unless the shortest match
+    is longer, since the budget is only a soft limit.
+
+    What is left of the budget changes from draw to draw, so only the
+    strategies for the lengths of the schema are cached (see
+    st_pattern_strings), budgeted strategies only share the parsed
+    pattern (see st_regex_strings).
+
+    :param schema: openapi_core Schema with a pattern.
+    :param budgeted_max_length: The maximum length allowed by the
+                                budget, or None for no budget.
+
+    :return: Strategy which generates strings matching the pattern.
+    """
+    min_length = schema.min_length or 0
+    strategy = st_pattern_strings(schema.pattern, min_length, schema.max_length)
+    if budgeted_max_length is not None:
+        budgeted = st_regex_strings(schema.pattern, min_length, budgeted_max_length)
+        strategy = strategy if budgeted.is_empty else budgeted
+    return strategy
+
+
+@st.composite
+def st_limited(draw, create_strategy, min_size, max_size, budget=None):
+    """
+    Generate a value from a strategy whose size is limited to what is
+    left of a budget at the time the value is drawn, rather than when
+    the strategy is created, e.g. for the items of an array.
+
+    :param draw: Callable to draw examples from other strategies.
+    :param create_strategy: Callable taking min_size and max_size and
+                            returning the strategy to draw from.
+    :param min_size: The minimum size the schema allows.
+    :param max_size: The maximum size the schema allows, or None.
+    :param budget: Optional Budget limiting the size of the value.
+
+    :return: The generated value.
+    """
+    if budget is not None:
+        max_size = budget.limit(min_size, max_size)
+    return draw(create_strategy(min_size=min_size, max_size=max_size))
+
+
+def encoded_size(value):
+    """
+    Estimate the number of bytes a value takes up once encoded in a
+    request body, using the size of its JSON encoding.
+
+    >>> encoded_size({"a": [1, "b"]})
+    15
+
+    :param value: The value to get the size of.
+
+    :return: The size in bytes.
+    """
+    if isinstance(value, bytes):
+        return len(value)
+    return len(json.dumps(value, default=str))
+
+
+class Budget:
+    """
+    The number of bytes left to spend on generating a request body.
+    Values are still generated once the budget has been spent, so that
+    minimum lengths etc. are met, but they are kept as small as the
+    schema allows.
+    """
+
+    def __init__(self, size):
+        """
+        :param size: The size of the budget in bytes.
+        """
+        self.remaining = size
+
+    def spend(self, size):
+        """
+        :param size: The number of bytes to spend.
+        """
+        self.remaining -= size
+
+    def limit(self, min_size, max_size, unit=1):
+        """
+        Limit the size of a value to what remains of the budget.
+
+        :param min_size: The minimum size the schema allows.
+        :param max_size: The maximum size the schema allows, or None.
+        :param unit: The maximum number of bytes per unit of size.
+
+        :return: The maximum size for the value.
+        """
+        limit = max(min_size, self.remaining // unit)
+        return limit if max_size is None else min(max_size, limit)
+
+
+@st.composite
+def st_spending(draw, strategy, budget):
+    """
+    Generate a value from strategy, spending its size from budget.
+
+    :param draw: Callable to draw examples from other strategies.
+    :param strategy: Strategy generating the value.
+    :param budget: Budget to spend the size of the value from.
+
+    :return: The generated value.
+    """
+    value = draw(strategy)
+    budget.spend(encoded_size(value))
+    return value
+
+
+def draw_examples(strategy, n, seed=None):
+    """
+    Draw values from a strategy outside of a hypothesis test, e.g. to
+    feed load testing tools or fuzzers.
+
+    Values are drawn directly from buffers of random bytes, without the
+    overhead of running a hypothesis test for them. Unlike values drawn
+    by a test, the values may repeat. With versions of hypothesis this
+    hasn't been checked against the values are drawn by running a test
+    which only generates instead, see _draw_examples_with_test.
+
+    :param strategy: The strategy to draw values from.
+    :param n: The number of values to draw.
+    :param seed: Seed for the values, the same seed draws the same
+                 values.
+
+    :return: list of n values.
+    """
+    if ConjectureData is None:  # pragma: no cover
+        return _draw_examples_with_test(strategy, n, seed)
+
+    rng = random.Random(seed)
+    values = []
+    rejected = 0
+    while len(values) < n:
+        buffer = rng.getrandbits(8 * DRAW_BUFFER_SIZE).to_bytes(DRAW_BUFFER_SIZE, "big")
+        try:
+            values.append(ConjectureData.for_buffer(buffer).draw(strategy))
+            rejected = 0
+        except StopTest:
+            # The draw was filtered out, or ran out of bytes.
+            rejected += 1
+            if rejected >= MAX_REJECTED_DRAWS:
+                raise Unsatisfiable(f"Unable to draw values from {strategy!r}")
+    return values
+
+
+def _draw_examples_with_test(strategy, n, seed=None):
+    """
+    Draw values from a strategy by running a test which only generates,
+    without shrinking, replaying or saving examples.
+
+    Hypothesis doesn't generate the same value twice in a run, so runs
+    are repeated until there are n values, which happens when the
+    strategy can generate fewer than n distinct values.
+
+    :param strategy: The strategy to draw values from.
+    :param n: The number of values to draw.
+    :param seed: Seed for the values, the same seed draws the same
+                 values.
+
+    :return: list of n values.
+    """
+    values = []
+    while len(values) < n:
+
+        @settings(
+            max_examples=n - len(values),
+            database=None,
+            deadline=None,
+            phases=[Phase.generate],
+            suppress_health_check=HealthCheck.all(),
+            verbosity=Verbosity.quiet,
+        )
+        @given(strategy)
+        def collect(value):
+            if len(values) < n:
+                values.append(value)
+
+        if seed is not None:
+            collect = hypothesis.seed(seed)(collect)
+        # Hypothesis raises Unsatisfiable when a run draws no values.
+        collect()
+    return values
 
 
 def instance_composite(fn):
@@ -120,7 +400,7 @@ class Strategies:
     api specification schema.
     """
 
-    def __init__(self, format_strategies=None):
+    def __init__(self, format_strategies=None, max_body_size=None):
         """
         Initialise this instance.
 
@@ -128,43 +408,76 @@ class Strategies:
                                   generating data for various formats.
                                   These strategies take the schema being
                                   generated as a parameter.
+        :param max_body_size: Budget in bytes for generating request
+                              bodies, or None for no budget. Bodies are
+                              only larger than this when the minimum
+                              lengths in the schema require it.
         """
         self._format_strategies = format_strategies or {}
+        self._format_strategies_key = tuple(sorted(self._format_strategies.items(), key=first))
+        self.max_body_size = max_body_size
 
-    def format_strategies(self, schema):
+    def format_strategies(self, schema, budget=None):
         """
 
         :param schema:
+        :param budget: Optional Budget limiting the size of values.
 
         :return:
         """
-        min_max_size = dict(min_size=schema.min_length or 0, max_size=schema.max_length)
+        min_size = schema.min_length or 0
+        limited = partial(st_limited, min_size=min_size, max_size=schema.max_length, budget=budget)
         return {
             **self._format_strategies,
             "uuid": st.uuids().map(str),
-            "uri": st_uris(),
-            "uriref": st_uris(),
-            "hostname": st_hostnames(),
+            "uri": limited(st_uris),
+            "uriref": limited(st_uris),
+            "hostname": limited(st_hostnames),
             "date": st.dates().map(str),
             "date-time": st.datetimes().map(datetime.isoformat),
-            "binary": st.binary(**min_max_size),
-            "byte": st.binary(**min_max_size).map(base64.encodebytes),
+            "binary": limited(st.binary),
+            "byte": limited(st.binary).map(base64.encodebytes),
             "int32": self.numbers(st_base=st.integers, schema=schema),
             "int64": self.numbers(st_base=st.integers, schema=schema),
             "float": self.numbers(st_base=st.floats, schema=schema),
             "double": self.numbers(st_base=st.floats, schema=schema),
         }
 
-    def _strategy_for_schema(self, schema):
+    def _strategy_for_schema(self, schema, budget=None):
         """
         Get the hypothesis strategy which can be used to generate values for
         the given schema.`
 
+        Strategies without a budget are cached per process for each
+        schema and set of format strategies, schemas are interned (see
+        openapi_conformance.extension.InterningSchemaRegistry) so that
+        identical schemas share the same strategy.
+
         :param schema: openapi_core Schema to generate values for.
+        :param budget: Optional Budget limiting the size of values.
 
         :return: Hypothesis strategy that generates values for schema.
         """
-        format_strategies = self.format_strategies(schema)
+        if budget is not None:
+            return self._create_strategy_for_schema(schema, budget)
+
+        key = (self._format_strategies_key, schema)
+        strategy = _schema_strategies.get(key)
+        if strategy is None:
+            strategy = _schema_strategies.setdefault(key, self._create_strategy_for_schema(schema))
+        return strategy
+
+    def _create_strategy_for_schema(self, schema, budget=None):
+        """
+        Create the hypothesis strategy which can be used to generate
+        values for the given schema, see _strategy_for_schema.
+
+        :param schema: openapi_core Schema to generate values for.
+        :param budget: Optional Budget limiting the size of values.
+
+        :return: Hypothesis strategy that generates values for schema.
+        """
+        format_strategies = self.format_strategies(schema, budget)
 
         if schema.format and schema.format not in format_strategies:
             raise ValueError(f"unsupported format {schema.format}")
@@ -173,17 +486,41 @@ class Strategies:
             result = format_strategies[schema.format]
         else:
             result = {
-                SchemaType.ANY: self.objects,
+                SchemaType.ANY: partial(self.objects, budget=budget),
                 SchemaType.INTEGER: partial(self.numbers, st_base=st.integers),
                 SchemaType.NUMBER: partial(self.numbers, st_base=st.floats),
-                SchemaType.STRING: self.strings,
+                SchemaType.STRING: partial(self.strings, budget=budget),
                 SchemaType.BOOLEAN: lambda *_, **__: st.booleans(),
-                SchemaType.ARRAY: self.arrays,
-                SchemaType.OBJECT: self.objects,
+                SchemaType.ARRAY: partial(self.arrays, budget=budget),
+                SchemaType.OBJECT: partial(self.objects, budget=budget),
             }[schema.type](schema=schema)
 
+        result = self.with_examples(result, schema)
+
+        # Arrays and objects spend the budget on their items.
+        is_container = schema.type in (SchemaType.ANY, SchemaType.ARRAY, SchemaType.OBJECT)
+        if budget is not None and (schema.format or not is_container):
+            result = st_spending(result, budget)
+
         return result
 
+    @staticmethod
+    def with_examples(strategy, definition):
+        """
+        Mix the examples given in the specification for a schema,
+        parameter or media type into strategy. The examples come first
+        so that hypothesis prefers them and shrinks towards them.
+
+        :param strategy: Strategy to generate values with.
+        :param definition: openapi_core Schema, Parameter or MediaType
+                           which may have examples.
+
+        :return: Strategy which generates either documented examples
+                 or values from strategy.
+        """
+        examples = getattr(definition, "examples", None)
+        return st.one_of(st.sampled_from(examples), strategy) if examples else strategy
+
     @staticmethod
     def is_multiple_of(multiple_of):
         """
@@ -248,84 +585,126 @@ class Strategies:
         return draw(numbers)
 
     @instance_composite
-    def strings(self, draw, schema):
+    def strings(self, draw, schema, budget=None):
         """
         Generate some text that conforms to the given schema.
 
         :param draw: Callable to draw examples from other strategies.
         :param schema: The schema we are generating values for.
+        :param budget: Optional Budget limiting the size of the text.
 
         :return: str which conforms to the given schema.
         """
-        min_max = dict(min_size=schema.min_length or 0, max_size=schema.max_length)
+        min_size = schema.min_length or 0
+        max_size = schema.max_length
+        if budget is not None:
+            # Characters take up to 12 bytes once escaped in JSON.
+            max_size = budget.limit(min_size, schema.max_length, unit=12)
 
         if schema.enum:
-            strategy = st.sampled_from(schema.enum)
+            enum = schema.enum
+            if budget is not None:
+                # Prefer the values which fit in the budget, if any do.
+                enum = [value for value in enum if len(value) <= max_size] or enum
+            strategy = st.sampled_from(enum)
         elif schema.pattern:
-            strategy = st.from_regex(schema.pattern)
+            strategy = st_budgeted_pattern_strings(schema, None if budget is None else max_size)
         else:
-            strategy = st.text(**min_max)
+            strategy = st.text(min_size=min_size, max_size=max_size)
 
         return draw(strategy)
 
     @instance_composite
-    def arrays(self, draw, schema):
+    def arrays(self, draw, schema, budget=None):
         """
         Generate an array of other schema values that conform to the
         items schema.
 
         :param draw: Callable to draw examples from other strategies.
         :param schema: The schema we are generating values for.
+        :param budget: Optional Budget limiting the size of the array.
 
         :return: list whose items are schema values that conform to the
                  schemas defined in schema.items.
         """
-        items = draw(
-            st.lists(
-                self._strategy_for_schema(schema.items),
-                min_size=schema.min_items or 0,
-                max_size=schema.max_items,
+        min_items = schema.min_items or 0
+
+        if budget is None:
+            items = draw(
+                st.lists(
+                    self._strategy_for_schema(schema.items),
+                    min_size=min_items,
+                    max_size=schema.max_items,
+                )
             )
-        )
+        else:
+            # The items are drawn one at a time so that each item is
+            # limited to what the previous items left of the budget.
+            budget.spend(2)
+            max_items = budget.limit(min_items, schema.max_items, unit=2)
+            st_item = self._strategy_for_schema(schema.items, budget)
+            items = []
+            while len(items) < min_items or (
+                len(items) < max_items and budget.remaining > 0 and draw(st.integers(0, 4))
+            ):
+                budget.spend(2)
+                items.append(draw(st_item))
+
         return unique(items) if schema.unique_items else items
 
     @instance_composite
-    def objects(self, draw, schema):
+    def objects(self, draw, schema, budget=None):
         """
         Generate an object which conforms to the given schema.
 
         :param draw: Callable to draw examples from other strategies.
         :param schema: The schema we are generating values for.
+        :param budget: Optional Budget limiting the size of the object,
+                       once spent optional properties are left out.
 
         :return: Dictionary where the keys conform to the schema.
         """
         result = {}
+        if budget is not None:
+            budget.spend(2)
         for schema in schema.all_of or [schema]:
             required = set(schema.required)
             optional = draw(st_filtered_containers(set(schema.properties) - required))
             properties = keyfilter(lambda x: x in required | optional, schema.properties)
-            mapping = valmap(self._strategy_for_schema, properties)
-            result = {**result, **draw(st.fixed_dictionaries(mapping))}
+
+            if budget is None:
+                mapping = valmap(self._strategy_for_schema, properties)
+                result = {**result, **draw(st.fixed_dictionaries(mapping))}
+            else:
+                # Required properties come first, so that they are
+                # generated while there is still budget left.
+                names = sorted(properties, key=lambda name: name not in required)
+                for name in names:
+                    if name in required or budget.remaining > 0:
+                        budget.spend(encoded_size(name) + 4)
+                        result[name] = draw(self._strategy_for_schema(properties[name], budget))
 
             # TODO: Additional parameters
 
         return result
 
     @instance_composite
-    def schema_values(self, draw, schema):
+    def schema_values(self, draw, schema, budget=None):
         """
         Generate a value which conforms to the given schema.
 
         :param draw: Callable to draw examples from other strategies.
         :param schema: The schema we are generating values for.
+        :param budget: Optional Budget limiting the size of the value.
 
         :return: A value which conforms to the given schema.
         """
+        strategy_for_schema = partial(self._strategy_for_schema, budget=budget)
         if schema:
             if schema.one_of:
-                return draw(st.one_of(map(self._strategy_for_schema, schema.one_of)))
+                return draw(st.one_of(map(strategy_for_schema, schema.one_of)))
             else:
-                return draw(self._strategy_for_schema(schema))
+                return draw(strategy_for_schema(schema))
 
     @instance_composite
     def parameter_lists(self, draw, parameters):
@@ -339,6 +718,120 @@ class Strategies:
                  parameter and generated value.
         """
         return [
-            ParameterValue(param, draw(self.schema_values(param.schema)))
+            ParameterValue(param, draw(self.with_examples(self.schema_values(param.schema), param)))
             for param in parameters.values()
         ]
+
+    @instance_composite
+    def requests(self, draw, operation):
+        """
+        Generate the values for a request to a particular endpoint.
+
+        :param draw: Callable to draw examples from other strategies.
+        :param operation: openapi_core Operation to generate a request
+                          for.
+
+        :return: RequestValues containing the parameters, request body
+                 and mime type of the request body.
+        """
+        if operation.parameters:
+            parameters = draw(self.parameter_lists(operation.parameters))
+        else:
+            parameters = None
+
+        if operation.request_body:
+            mime_type, content = draw(st.sampled_from(list(operation.request_body.content.items())))
+            budget = None if self.max_body_size is None else Budget(self.max_body_size)
+            strategy = self.with_examples(self.schema_values(content.schema, budget), content)
+            if operation.request_body.required:
+                # An empty binary or text body can't be told apart from
+                # no body.
+                strategy = strategy.filter(lambda value: value not in (b"", ""))
+            request_body = draw(strategy)
+        else:
+            mime_type = "application/json"
+            request_body = None
+
+        return RequestValues(parameters, request_body, mime_type)
+
+    @staticmethod
+    def example_requests(operation):
+        """
+        Get the requests which can be made to a particular endpoint
+        using only the examples given in the specification. Parameters
+        and request bodies fall back on the examples of their schema.
+
+        Requests are only returned when the specification has an example
+        for every required parameter and for the request body, the
+        examples of the various parameters are cycled through so that
+        every example is used at least once.
+
+        :param operation: openapi_core Operation to get requests for.
+
+        :return: list of RequestValues.
+        """
+
+        parameters = _parameter_examples(operation)
+        bodies = _body_examples(operation)
+
+        missing = any(param.required and not values for param, values in parameters)
+        documented = any(values for _, values in parameters) or operation.request_body
+        if missing or not bodies or not documented:
+            return []
+        return _cycle_examples(parameters, bodies)
+
+
+def _examples(definition):
+    """
+    :param definition: openapi_core Parameter or MediaType.
+
+    :return: list of the examples given for definition, falling back on
+             the examples of its schema.
+    """
+    return getattr(definition, "examples", None) or getattr(definition.schema, "examples", None)
+
+
+def _parameter_examples(operation):
+    """
+    :param operation: openapi_core Operation.
+
+    :return: list of tuples of each Parameter and its examples.
+    """
+    return [(param, _examples(param)) for param in operation.parameters.values()]
+
+
+def _body_examples(operation):
+    """
+    :param operation: openapi_core Operation.
+
+    :return: list of tuples of example request body and mime type.
+    """
+    if not operation.request_body:
+        return [(None, "application/json")]
+    return [
+        (value, mime_type)
+        for mime_type, content in operation.request_body.content.items()
+        for value in _examples(content) or []
+    ]
+
+
+def _cycle_examples(parameters, bodies):
+    """
+    Combine examples of parameters and request bodies in to requests,
+    cycling through the examples so that every example is used at least
+    once.
+
+    :param parameters: list of tuples of Parameter and its examples.
+    :param bodies: list of tuples of example request body and mime type.
+
+    :return: list of RequestValues.
+    """
+    parameters = [(param, values) for param, values in parameters if values]
+    count = max([len(bodies)] + [len(values) for _, values in parameters])
+    return [
+        RequestValues(
+            [ParameterValue(param, values[i % len(values)]) for param, values in parameters],
+            *bodies[i % len(bodies)],
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,111 @@
+# std
+from pathlib import Path
+
+# 3rd party
+from hypothesis import given
+from hypothesis import strategies as st
+from openapi_core.schema.schemas.models import Schema
+from openapi_core.wrappers.mock import MockRequest, MockResponse
+
+# openapi_conformance
+from openapi_conformance import OpenAPIConformance
+from openapi_conformance.codecs import BinaryCodec, EncodedRequest, FormCodec, MultipartCodec
+
+DIR = Path(__file__).parent
+
+
+def object_schema(value):
+    """
+    :param value: dict to get the schema for.
+
+    :return: openapi_core Schema of an object whose properties are
+             arrays where value has lists.
+    """
+    properties = {
+        name: Schema("array" if isinstance(item, list) else "string")
+        for name, item in value.items()
+    }
+    return Schema("object", properties=properties)
+
+
+@given(st.dictionaries(st.text(min_size=1), st.text() | st.lists(st.text())))
+def test_form_round_trip(value):
+    """
+    Check that form bodies decode to what was encoded, including values
+    containing = and &, repeated keys and lists of any length.
+    """
+    codec = FormCodec()
+    assert codec.decode(codec.encode(value), object_schema(value)) == value
+
+
+@given(
+    st.dictionaries(
+        st.text(min_size=1),
+        st.binary() | st.text() | st.integers() | st.lists(st.binary()),
+    )
+)
+def test_multipart_round_trip(value):
+    """
+    Check that multipart bodies decode to what was encoded, whatever
+    the content of the parts.
+    """
+    codec = MultipartCodec()
+    body = codec.encode(value)
+    boundary = codec.boundary(value)
+    assert body.endswith(b"--%s--\r\n" % boundary)
+    assert codec.content_type("multipart/form-data", value).endswith(boundary.decode())
+    assert codec.decode(body, object_schema(value)) == value
+
+
+def test_binary_not_copied():
+    """
+    Check that binary bodies are streamed as views on to the value
+    rather than copies of it.
+    """
+    value = bytes(range(256)) * 1024
+    codec = BinaryCodec()
+    assert codec.encode(value) is value
+    chunks = list(codec.iter_encode(value, chunk_size=1000))
+    assert all(chunk.obj is value for chunk in chunks)
+    assert b"".join(chunks) == value
+
+
+def test_form_validated_with_schema():
+    """
+    Check that form bodies with arrays of one or no items conform, both
+    when validated from the encoded body and from the encoded value.
+    """
+    conformance = OpenAPIConformance(DIR / "data" / "request-bodies.yaml", None)
+    mime_type = "application/x-www-form-urlencoded"
+    response = MockResponse(b"", 204)
+    for value in ({"name": "a", "tags": ["b"]}, {"name": "a", "tags": []}):
+        body = FormCodec().encode(value)
+        request = MockRequest("http://host.com/", "post", "/form", data=body, mimetype=mime_type)
+        conformance.check_response(request, response)
+
+        request = EncodedRequest("http://host.com/", "post", "/form", FormCodec(), value, mime_type)
+        conformance.check_response(request, response)
+        assert request.body == body
+
+
+def test_binary_text():
+    """
+    Check that text sent as a binary body, for a schema which isn't of
+    the binary format, is encoded as UTF-8.
+    """
+    codec = BinaryCodec()
+    value = "caf\u00e9" * 1000
+    assert codec.encode(value) == value.encode()
+    assert b"".join(codec.iter_encode(value, chunk_size=1000)) == value.encode()
+    assert codec.decode(value.encode(), Schema("string")) == value
+    assert codec.decode(value.encode(), Schema("string", schema_format="binary")) == value.encode()
+
+
+def test_multipart_boundary_in_view():
+    """
+    Check that the boundary doesn't occur in parts which are views.
+    """
+    codec = MultipartCodec()
+    value = {"file": memoryview(b"--openapi-conformance-boundary--")}
+    assert codec.boundary(value) == b"openapi-conformance-boundary-1"
+    assert codec.decode(codec.encode(value)) == {"file": bytes(value["file"])}
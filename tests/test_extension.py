@@ -0,0 +1,74 @@
+# std
+import json
+import threading
+
+# 3rd party
+from openapi_core.schema.schemas.models import Schema
+from openapi_core.wrappers.mock import MockRequest
+
+# openapi_conformance
+from openapi_conformance.codecs import EncodedRequest, FunctionCodec
+from openapi_conformance.extension import request_fingerprint, strict_str
+
+
+def test_patches_thread_local():
+    """
+    Check that patching openapi_core in one thread doesn't affect any
+    other threads.
+    """
+    original = Schema.STRING_FORMAT_CALLABLE_GETTER
+    patched, release = threading.Event(), threading.Event()
+    seen = []
+
+    def patch():
+        with strict_str():
+            seen.append(Schema.STRING_FORMAT_CALLABLE_GETTER)
+            patched.set()
+            release.wait()
+
+    thread = threading.Thread(target=patch)
+    thread.start()
+    patched.wait()
+    try:
+        assert Schema.STRING_FORMAT_CALLABLE_GETTER is original
+        assert seen[0] is not original
+    finally:
+        release.set()
+        thread.join()
+
+    assert Schema.STRING_FORMAT_CALLABLE_GETTER is original
+
+
+def test_request_fingerprint_body_digest():
+    """
+    Check that fingerprints identify requests by a digest of their body,
+    rather than holding on to the body.
+    """
+
+    def fingerprint(body):
+        return request_fingerprint(MockRequest("http://host.com/", "post", "/", data=body))
+
+    body = b"x" * 1024 * 1024
+    assert fingerprint(body) == fingerprint(b"x" * 1024 * 1024)
+    assert fingerprint(body) != fingerprint(body + b"x")
+    assert all(part is not body and len(repr(part)) < 1024 for part in fingerprint(body))
+
+
+def test_request_fingerprint_encodes_once():
+    """
+    Check that the body encoded for the fingerprint of a request is
+    reused when the request is sent.
+    """
+    encoded = []
+
+    def encode(value):
+        encoded.append(value)
+        return json.dumps(value).encode()
+
+    codec = FunctionCodec(encode)
+    request = EncodedRequest("http://host.com/", "post", "/", codec, {"a": 1}, "application/json")
+    request_fingerprint(request)
+
+    assert request.body == b'{"a": 1}'
+    assert b"".join(request.iter_body()) == request.body
+    assert encoded == [{"a": 1}]
@@ -0,0 +1,53 @@
+# std
+import json
+import time
+from pathlib import Path
+
+# 3rd party
+from openapi_core.wrappers.mock import MockResponse
+
+# openapi_conformance
+from openapi_conformance import OpenAPIConformance
+
+DIR = Path(__file__).parent
+
+
+def send_request(operation, request):
+    """
+    Stand in for a server which is slow to respond when asked for more
+    than 1000 items.
+    """
+    limit = int(request.parameters["query"]["limit"])
+    if limit > 1000:
+        time.sleep(0.02)
+    return MockResponse(json.dumps(list(range(min(limit, 10)))).encode())
+
+
+def test_seek_latency():
+    """
+    Check that the slowest requests are shrunk and reported, and that
+    the minimal request exceeding the threshold from the specification
+    is found.
+    """
+    conformance = OpenAPIConformance(DIR / "data" / "latency.yaml", send_request)
+    (report,) = conformance.seek_latency(slowest=3)
+
+    assert report.threshold == 0.01
+    assert 0 < len(report.slowest) <= 3
+    latencies = [slow.latency for slow in report.slowest]
+    assert latencies == sorted(latencies, reverse=True)
+    assert report.slowest[0].request.parameters["query"]["limit"] == 1001
+    assert report.exceeded.request.parameters["query"]["limit"] == 1001
+    assert "1001" in str(report)
+
+
+def test_seek_latency_thresholds():
+    """
+    Check that configured thresholds take precedence over the
+    specification.
+    """
+    conformance = OpenAPIConformance(DIR / "data" / "latency.yaml", send_request)
+    (report,) = conformance.seek_latency({"listItems": 1.0})
+
+    assert report.threshold == 1.0
+    assert report.exceeded is None
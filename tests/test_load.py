@@ -0,0 +1,74 @@
+# std
+import json
+import time
+from pathlib import Path
+
+# 3rd party
+from openapi_core.wrappers.mock import MockResponse
+from pytest import approx
+
+# openapi_conformance
+from openapi_conformance import OpenAPIConformance
+from openapi_conformance.load import percentile
+
+DIR = Path(__file__).parent
+
+
+def send_request(operation, request):
+    """
+    Stand in for a server which takes a little while to respond with an
+    empty object, or a 404 for anything but the root.
+    """
+    time.sleep(0.001)
+    status_code = 200 if operation.path_name == "/" else 404
+    return MockResponse(json.dumps({}).encode(), status_code)
+
+
+def test_load():
+    """
+    Check that generating load sends requests to all operations,
+    validating responses and reporting the non conforming ones.
+    """
+    conformance = OpenAPIConformance(DIR / "data" / "api-with-examples.yaml", send_request)
+    report = conformance.load(0.5, concurrency=4, validate=1.0, seed=0)
+
+    assert report.requests > 0
+    assert report.throughput > 0
+    for operation, load in report.operations.items():
+        assert load.requests > 0
+        assert load.errors == 0
+        assert load.validated == load.requests
+        assert load.latency(50) <= load.latency(95) <= load.latency(99)
+        assert load.failure_rate == (0.0 if operation.path_name == "/" else 1.0)
+
+
+def test_load_rate_weights():
+    """
+    Check that the request rate limits the number of requests sent and
+    that operations with no weight are not requested.
+    """
+    conformance = OpenAPIConformance(DIR / "data" / "api-with-examples.yaml", send_request)
+    report = conformance.load(0.5, rate=20, weights={"getVersionDetailsv2": 0})
+
+    requests = {operation.path_name: load.requests for operation, load in report.operations.items()}
+    assert 0 < requests["/"] <= 11
+    assert requests["/v2"] == 0
+
+
+def test_load_throughput():
+    """
+    Check that the throughput of each operation adds up to the total
+    throughput.
+    """
+    conformance = OpenAPIConformance(DIR / "data" / "api-with-examples.yaml", send_request)
+    report = conformance.load(0.2)
+
+    for load in report.operations.values():
+        assert load.throughput == load.requests / report.duration
+    assert sum(load.throughput for load in report.operations.values()) == approx(report.throughput)
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(list(range(1, 101)), 99) == 99
@@ -41,6 +41,9 @@ conformances = [
             None,
             format_unmarshallers=format_unmarshallers,
             format_strategies=format_strategies,
+            # Responses are drawn at random, so the same request does
+            # not always get the same response.
+            deduplicate_requests=False,
         ),
     )
     for directory in [DIR / "data"]
@@ -102,3 +105,207 @@ def test_round_trip(filename, conformance, operation):
         conformance.check_operation(operation)
 
     check()
+
+
+def test_examples_requested_first():
+    """
+    Check that the examples given in the specification are used to
+    make a request before any values are generated.
+    """
+
+    class Sent(Exception):
+        pass
+
+    def send_request(operation, request):
+        raise Sent(request)
+
+    conformance = OpenAPIConformance(DIR / "data" / "uspto.yaml", send_request)
+    operation = conformance.specification["/{dataset}/{version}/fields"].operations["get"]
+
+    with pytest.raises(Sent) as info:
+        conformance.check_operation(operation)
+
+    (request,) = info.value.args
+    assert request.parameters["path"] == {"dataset": "oa_citations", "version": "v1"}
+
+
+def test_duplicate_requests_not_sent():
+    """
+    Check that identical requests to an operation are only sent once
+    they have been found to conform.
+    """
+    responses = []
+
+    def send_request(operation, request):
+        responses.append(MockResponse(b"{}", 200))
+        return responses[-1]
+
+    conformance = OpenAPIConformance(DIR / "data" / "api-with-examples.yaml", send_request)
+    conformance.check_operation(conformance.specification["/"].operations["get"])
+
+    assert len(responses) == 1
+
+
+def test_response_cache():
+    """
+    Check that when hypothesis replays a failing GET request the cached
+    response is checked rather than sending the request again.
+    """
+    responses = []
+
+    def send_request(operation, request):
+        responses.append(MockResponse(b"{}", 404))
+        return responses[-1]
+
+    conformance = OpenAPIConformance(
+        DIR / "data" / "api-with-examples.yaml", send_request, response_cache_size=10
+    )
+    with pytest.raises(Exception):
+        conformance.check_operation(conformance.specification["/"].operations["get"])
+
+    assert len(responses) == 1
+
+
+def test_collect_failures():
+    """
+    Check that when collecting failures every operation is checked and
+    that the failures contain the request and response that failed.
+    """
+
+    def send_request(operation, request):
+        return MockResponse(b"{}", 404)
+
+    conformance = OpenAPIConformance(DIR / "data" / "api-with-examples.yaml", send_request)
+    failures = conformance.check(collect_failures=True)
+
+    assert {failure.operation.path_name for failure in failures} == {"/", "/v2"}
+    for failure in failures:
+        assert failure.request.path.endswith(failure.operation.path_name)
+        assert failure.response.status_code == 404
+        assert isinstance(failure.error, Exception)
+
+
+def test_check_threads():
+    """
+    Check that operations can be checked on multiple threads.
+    """
+
+    def send_request(operation, request):
+        return MockResponse(b"{}", 404)
+
+    conformance = OpenAPIConformance(DIR / "data" / "petstore.yaml", send_request)
+    failures = conformance.check(collect_failures=True, threads=4)
+
+    assert [failure.operation for failure in failures] == list(conformance.operations)
+
+    with pytest.raises(Exception):
+        conformance.check(threads=4)
+
+
+def test_schemas_interned():
+    """
+    Check that schemas which are the same share one Schema object and
+    one strategy, also across specifications.
+    """
+    petstore, expanded = (
+        OpenAPIConformance(DIR / "data" / filename, None)
+        for filename in ("petstore.yaml", "petstore-expanded.yaml")
+    )
+    error, expanded_error = (
+        conformance.specification.get_schema("Error") for conformance in (petstore, expanded)
+    )
+
+    assert error is expanded_error
+    assert st_conformance._strategy_for_schema(error) is Strategies()._strategy_for_schema(
+        expanded_error
+    )
+
+
+def test_example_database(tmp_path):
+    """
+    Check that failing examples are stored in the example database and
+    replayed first by later runs sharing the database.
+    """
+    usernames = []
+
+    def send_request(operation, request):
+        username = request.parameters["query"]["username"]
+        usernames.append(username)
+        return MockResponse(b"{}", 404 if len(username) > 12 else 200)
+
+    def check():
+        usernames.clear()
+        conformance = OpenAPIConformance(
+            DIR / "data" / "pattern.yaml", send_request, example_database=tmp_path
+        )
+        with pytest.raises(Exception):
+            conformance.check()
+
+    check()
+    failing = usernames[-1]
+    assert len(failing) > 12
+    assert list(tmp_path.iterdir())
+
+    check()
+    assert usernames[0] == failing
+
+
+def test_generate():
+    """
+    Check that batches of requests are generated reproducibly, with the
+    parameters split by location and the body encoded.
+    """
+    conformance = OpenAPIConformance(DIR / "data" / "petstore-expanded.yaml", None)
+    get_pet = conformance.specification["/pets/{id}"].operations["get"]
+    add_pet = conformance.specification["/pets"].operations["post"]
+
+    records = conformance.generate(get_pet, 20, seed=1)
+    assert len(records) == 20
+    assert records == conformance.generate(get_pet, 20, seed=1)
+    for record in records:
+        assert record.method == "GET"
+        assert record.path.endswith(f"/pets/{record.path_parameters['id']}")
+        assert record.body is None
+
+    for record in conformance.generate(add_pet, 20):
+        assert record.content_type == "application/json"
+        assert "name" in json.loads(record.body)
+
+
+def test_select():
+    """
+    Check that operations are selected by operationId, tag, method and
+    path prefix, and that only the selected operations are created.
+    """
+    conformance = OpenAPIConformance(DIR / "data" / "petstore-expanded.yaml", None)
+    paths = conformance.specification.paths
+
+    (find_pet,) = conformance.select(operation_id="find pet by id")
+    assert (find_pet.path_name, find_pet.http_method) == ("/pets/{id}", "get")
+    assert list(paths["/pets/{id}"].operations._operations) == ["get"]
+    assert not paths["/pets"].operations._operations
+
+    def selected(**criteria):
+        return [(op.path_name, op.http_method) for op in conformance.select(**criteria)]
+
+    assert selected(method="DELETE") == [("/pets/{id}", "delete")]
+    assert selected(path_prefix="/pets/", method=["get", "post"]) == [("/pets/{id}", "get")]
+    assert len(selected()) == 4
+    assert selected(tag="missing") == []
+
+
+def test_check_select():
+    """
+    Check that only the selected operations are checked.
+    """
+    checked = set()
+
+    def send_request(operation, request):
+        checked.add(operation.operation_id)
+        return MockResponse(b"{}", 404)
+
+    conformance = OpenAPIConformance(DIR / "data" / "petstore-expanded.yaml", send_request)
+    failures = conformance.check(collect_failures=True, select={"method": "get"})
+
+    assert checked == {"findPets", "find pet by id"}
+    assert len(failures) == 2
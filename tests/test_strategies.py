@@ -1,14 +1,24 @@
 # std
 import operator
+import re
 from unittest.mock import MagicMock
 
 # 3rd party
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
+from hypothesis.errors import Unsatisfiable
+from openapi_core.schema.schemas.models import Schema
 
 # openapi_conformance
-from openapi_conformance.strategies import Strategies
+from openapi_conformance import strategies
+from openapi_conformance.strategies import (
+    Budget,
+    Strategies,
+    draw_examples,
+    encoded_size,
+    st_pattern_strings,
+)
 
 
 def test_unsupported_format():
@@ -56,3 +66,114 @@ def test_multiple_of():
     """
     assert Strategies.is_multiple_of(10)(20)
     assert not Strategies.is_multiple_of(3)(4)
+
+
+@given(st.data())
+def test_pattern_strings(data):
+    """
+    Check that strings generated for a pattern match the pattern as a
+    whole and respect the min and max length of the schema.
+
+    :param data: Data strategy for interactively drawing examples.
+    """
+    schema = MagicMock(enum=None, pattern=re.compile(r"^The.*Spain$"), min_length=10, max_length=20)
+    value = data.draw(Strategies().strings(schema))
+
+    assert schema.pattern.fullmatch(value)
+    assert 10 <= len(value) <= 20
+
+
+def test_pattern_strings_cached():
+    """
+    Check that strategies for the same pattern are only created once.
+    """
+    assert st_pattern_strings(r"[a-z]+") is st_pattern_strings(r"[a-z]+")
+
+
+@given(st.data())
+def test_pattern_strings_budget_not_cached(data):
+    """
+    Check that the strategies for the different lengths left of a
+    budget aren't cached.
+
+    :param data: Data strategy for interactively drawing examples.
+    """
+    schema = Schema("string", pattern=r"^[a-z]+$")
+    cached = st_pattern_strings.cache_info().currsize
+    value = data.draw(Strategies().schema_values(schema, Budget(data.draw(st.integers(0, 100)))))
+
+    assert schema.pattern.fullmatch(value)
+    assert st_pattern_strings.cache_info().currsize <= cached + 1
+
+
+@pytest.mark.parametrize(
+    "string",
+    [
+        Schema("string", min_length=5),
+        Schema("string", pattern=r"^[a-z]+$", min_length=5),
+        Schema("string", schema_format="uri", min_length=5),
+        Schema("string", schema_format="uriref", min_length=5),
+        Schema("string", schema_format="hostname", min_length=5),
+    ],
+)
+@given(data=st.data())
+def test_budget(string, data):
+    """
+    Check that values generated with a budget only go over the budget
+    when that is needed to meet the minimum lengths of the schema.
+
+    :param string: Schema of the strings to generate.
+    :param data: Data strategy for interactively drawing examples.
+    """
+    array = Schema("array", items=string, min_items=2)
+    schema = Schema("object", properties={"a": array}, required=["a"])
+
+    size = data.draw(st.sampled_from([10, 100, 1000]))
+    budget = Budget(size)
+    value = data.draw(Strategies().schema_values(schema, budget))
+
+    assert len(value["a"]) >= 2
+    assert all(len(item) >= 5 for item in value["a"])
+    assert encoded_size(value) <= size - budget.remaining
+
+    # When the budget covers the minimum we go over by at most one more
+    # item, of 5 characters which are up to 12 bytes each once escaped.
+    if size >= 100:
+        assert encoded_size(value) <= size + 64
+
+
+@given(st.data())
+def test_pattern_strings_min_length(data):
+    """
+    Check that strings are generated for a pattern with a min length
+    that the unfiltered pattern hardly ever reaches.
+
+    :param data: Data strategy for interactively drawing examples.
+    """
+    schema = MagicMock(enum=None, pattern=re.compile(r"^[a-z]+$"), min_length=40, max_length=None)
+    value = data.draw(Strategies().strings(schema))
+
+    assert schema.pattern.fullmatch(value)
+    assert len(value) >= 40
+
+
+@pytest.mark.parametrize("conjecture_data", [strategies.ConjectureData, None])
+def test_draw_examples(monkeypatch, conjecture_data):
+    """
+    Check that values are drawn reproducibly, both directly and by
+    running a test when the hypothesis internals aren't available.
+
+    :param monkeypatch: Fixture for patching the module.
+    :param conjecture_data: ConjectureData, or None to draw by running a
+                            test.
+    """
+    monkeypatch.setattr(strategies, "ConjectureData", conjecture_data)
+    strategy = st.integers(0, 100).filter(lambda value: value % 2)
+
+    values = draw_examples(strategy, 50, seed=1)
+    assert len(values) == 50
+    assert all(value % 2 for value in values)
+    assert values == draw_examples(strategy, 50, seed=1)
+
+    with pytest.raises(Unsatisfiable):
+        draw_examples(st.nothing(), 1)